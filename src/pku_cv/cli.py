@@ -1,8 +1,38 @@
 from __future__ import annotations
 
 import argparse
-
-from . import exporter, phase1_discovery, phase2_enrich, phase3_normalize
+import sys
+from typing import Dict, List, Optional
+
+PHASE1_DEFAULTS: Dict[str, object] = {
+    "seed_start": 0,
+    "seed_limit": 0,
+    "max_pages_per_seed": 30,
+    "timeout": 25,
+    "no_resume": False,
+    "no_cache": False,
+    "require_deepseek": False,
+}
+PHASE2_DEFAULTS: Dict[str, object] = {
+    "limit": 0,
+    "no_resume": False,
+    "no_cache": False,
+    "workers": 16,
+    "no_web_search": False,
+    "retry_incomplete": False,
+}
+PHASE3_DEFAULTS: Dict[str, object] = {
+    "limit": 0,
+    "no_resume": False,
+    "no_cache": False,
+}
+COMMAND_DEFAULTS: Dict[str, Dict[str, object]] = {
+    "phase1": PHASE1_DEFAULTS,
+    "phase2": PHASE2_DEFAULTS,
+    "phase3": PHASE3_DEFAULTS,
+    "export": {},
+    "all": {**PHASE1_DEFAULTS, **PHASE2_DEFAULTS, **PHASE3_DEFAULTS},
+}
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -13,44 +43,82 @@ def build_parser() -> argparse.ArgumentParser:
     sub = parser.add_subparsers(dest="command", required=True)
 
     p1 = sub.add_parser("phase1", help="Discover professor names from school faculty-list pages")
-    p1.add_argument("--seed-start", type=int, default=0)
-    p1.add_argument("--seed-limit", type=int, default=0)
-    p1.add_argument("--max-pages-per-seed", type=int, default=30)
-    p1.add_argument("--timeout", type=int, default=25)
+    p1.add_argument("--seed-start", type=int)
+    p1.add_argument("--seed-limit", type=int)
+    p1.add_argument("--max-pages-per-seed", type=int)
+    p1.add_argument("--timeout", type=int)
     p1.add_argument("--no-resume", action="store_true")
+    p1.add_argument("--no-cache", action="store_true")
     p1.add_argument("--require-deepseek", action="store_true")
+    p1.set_defaults(**COMMAND_DEFAULTS["phase1"])
 
     p2 = sub.add_parser("phase2", help="Enrich professor records via DeepSeek web search")
-    p2.add_argument("--limit", type=int, default=0)
+    p2.add_argument("--limit", type=int)
     p2.add_argument("--no-resume", action="store_true")
-    p2.add_argument("--workers", type=int, default=3)
+    p2.add_argument("--no-cache", action="store_true")
+    p2.add_argument("--workers", type=int)
     p2.add_argument("--no-web-search", action="store_true")
+    p2.add_argument("--retry-incomplete", action="store_true")
+    p2.set_defaults(**COMMAND_DEFAULTS["phase2"])
 
     p3 = sub.add_parser("phase3", help="Normalize school/institute names")
-    p3.add_argument("--limit", type=int, default=0)
+    p3.add_argument("--limit", type=int)
     p3.add_argument("--no-resume", action="store_true")
+    p3.add_argument("--no-cache", action="store_true")
+    p3.set_defaults(**COMMAND_DEFAULTS["phase3"])
 
     sub.add_parser("export", help="Export final CSV aligned with professors_template.csv")
 
     pall = sub.add_parser("all", help="Run all phases + export")
-    pall.add_argument("--seed-start", type=int, default=0)
-    pall.add_argument("--seed-limit", type=int, default=0)
-    pall.add_argument("--max-pages-per-seed", type=int, default=30)
-    pall.add_argument("--timeout", type=int, default=25)
-    pall.add_argument("--limit", type=int, default=0)
+    pall.add_argument("--seed-start", type=int)
+    pall.add_argument("--seed-limit", type=int)
+    pall.add_argument("--max-pages-per-seed", type=int)
+    pall.add_argument("--timeout", type=int)
+    pall.add_argument("--limit", type=int)
     pall.add_argument("--no-resume", action="store_true")
+    pall.add_argument("--no-cache", action="store_true")
     pall.add_argument("--require-deepseek", action="store_true")
-    pall.add_argument("--workers", type=int, default=3)
+    pall.add_argument("--workers", type=int)
     pall.add_argument("--no-web-search", action="store_true")
+    pall.add_argument("--retry-incomplete", action="store_true")
+    pall.set_defaults(**COMMAND_DEFAULTS["all"])
 
     return parser
 
 
-def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
+def _parse_fast_path(argv: List[str]) -> Optional[argparse.Namespace]:
+    # A bare subcommand needs no parsing; skip building the argparse tree for it.
+    if len(argv) != 1 or argv[0] not in COMMAND_DEFAULTS:
+        return None
+    return argparse.Namespace(command=argv[0], **COMMAND_DEFAULTS[argv[0]])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    args = _parse_fast_path(argv)
+    if args is None:
+        args = build_parser().parse_args(argv)
+
+    if getattr(args, "no_cache", False):
+        from .deepseek_client import set_response_cache_refresh
+
+        set_response_cache_refresh(True)
+        if args.command in ("phase1", "all"):
+            from .phase1_discovery import set_candidate_pairs_cache_refresh
+
+            set_candidate_pairs_cache_refresh(True)
+        if args.command in ("phase2", "all"):
+            from .phase2_enrich import set_profile_cache_refresh
+
+            set_profile_cache_refresh(True)
+        if args.command in ("phase3", "all"):
+            from .phase3_normalize import set_normalization_cache_refresh
+
+            set_normalization_cache_refresh(True)
 
     if args.command == "phase1":
+        from . import phase1_discovery
+
         phase1_discovery.run(
             seed_start=args.seed_start,
             seed_limit=args.seed_limit if args.seed_limit > 0 else None,
@@ -62,15 +130,20 @@ def main() -> None:
         return
 
     if args.command == "phase2":
+        from . import phase2_enrich
+
         phase2_enrich.run(
             limit=args.limit if args.limit > 0 else None,
             resume=not args.no_resume,
             workers=args.workers,
             enable_web_search_fallback=not args.no_web_search,
+            retry_incomplete=args.retry_incomplete,
         )
         return
 
     if args.command == "phase3":
+        from . import phase3_normalize
+
         phase3_normalize.run(
             limit=args.limit if args.limit > 0 else None,
             resume=not args.no_resume,
@@ -78,10 +151,14 @@ def main() -> None:
         return
 
     if args.command == "export":
+        from . import exporter
+
         exporter.run()
         return
 
     if args.command == "all":
+        from . import exporter, phase1_discovery, phase2_enrich, phase3_normalize
+
         phase1_discovery.run(
             seed_start=args.seed_start,
             seed_limit=args.seed_limit if args.seed_limit > 0 else None,
@@ -95,6 +172,7 @@ def main() -> None:
             resume=not args.no_resume,
             workers=args.workers,
             enable_web_search_fallback=not args.no_web_search,
+            retry_incomplete=args.retry_incomplete,
         )
         phase3_normalize.run(
             limit=args.limit if args.limit > 0 else None,
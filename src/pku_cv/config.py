@@ -20,15 +20,21 @@ MANUAL_DIR = DATA_DIR / "manual"
 SEED_ISSUES_JSONL = INTERIM_DIR / "seed_issues.jsonl"
 LISTING_PAGES_JSONL = INTERIM_DIR / "phase1_listing_pages.jsonl"
 NAME_CANDIDATES_JSONL = INTERIM_DIR / "phase1_name_candidates.jsonl"
+CANDIDATE_PAIRS_CACHE_JSONL = INTERIM_DIR / "phase1_candidate_pairs_cache.jsonl"
 PROFESSOR_NAMES_JSONL = INTERIM_DIR / "phase1_professor_names.jsonl"
 ENRICHED_JSONL = INTERIM_DIR / "phase2_professors_enriched.jsonl"
 NORMALIZED_JSONL = INTERIM_DIR / "phase3_professors_normalized.jsonl"
+NORMALIZATION_CACHE_JSONL = INTERIM_DIR / "phase3_normalization_cache.jsonl"
+DEEPSEEK_CACHE_JSONL = INTERIM_DIR / "deepseek_cache.jsonl"
+PROFILE_HTML_CACHE_DIR = INTERIM_DIR / "profile_html_cache"
 NORMALIZATION_REVIEW_JSONL = MANUAL_DIR / "normalization_review.jsonl"
 FINAL_OUTPUT_CSV = OUTPUT_DIR / "professors_output.csv"
 
 DEFAULT_TIMEOUT_SECONDS = int(os.getenv("PKU_CRAWL_TIMEOUT", "25"))
 DEFAULT_MAX_PAGES = int(os.getenv("PKU_MAX_PAGES_PER_SEED", "30"))
+DEFAULT_PROFILE_CACHE_TTL_DAYS = int(os.getenv("PKU_PROFILE_CACHE_TTL_DAYS", "30"))
 DEFAULT_DEEPSEEK_MODEL = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
+DEFAULT_DEEPSEEK_MAX_RPS = int(os.getenv("DEEPSEEK_MAX_RPS", "4"))
 DEFAULT_DEEPSEEK_ENDPOINT = os.getenv(
     "DEEPSEEK_ENDPOINT", "https://api.deepseek.com/chat/completions"
 )
@@ -1,13 +1,150 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import random
+import threading
 import time
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Deque, Dict, Optional
 
-import requests
+from .config import (
+    DEEPSEEK_CACHE_JSONL,
+    DEFAULT_DEEPSEEK_ENDPOINT,
+    DEFAULT_DEEPSEEK_MODEL,
+    DEFAULT_DEEPSEEK_MAX_RPS,
+)
+from .utils import append_jsonl, iter_jsonl, parse_json_list, parse_json_obj
 
-from .config import DEFAULT_DEEPSEEK_ENDPOINT, DEFAULT_DEEPSEEK_MODEL
+if TYPE_CHECKING:
+    import requests
+
+
+class _RateLimiter:
+    def __init__(self, max_calls: int, period: float = 1.0) -> None:
+        self.max_calls = max_calls
+        self.period = period
+        self._lock = threading.Lock()
+        self._calls: Deque[float] = deque()
+
+    def acquire(self) -> None:
+        if self.max_calls <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait_seconds = self.period - (now - self._calls[0])
+            time.sleep(wait_seconds)
+
+
+class _ResponseCache:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.refresh = False
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, str]] = None
+
+    @staticmethod
+    def key(model: str, temperature: float, prompt: str, system: Optional[str] = None) -> str:
+        raw = f"{model}\n{temperature}\n{prompt}"
+        if system is not None:
+            raw = f"{system}\n{raw}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is None:
+            self._entries = {
+                str(row.get("key", "")): str(row.get("content", ""))
+                for row in iter_jsonl(self.path)
+                if row.get("key") and str(row.get("content", "")).strip()
+            }
+        return self._entries
+
+    def get(self, key: str) -> Optional[str]:
+        if self.refresh:
+            return None
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, content: str) -> None:
+        with self._lock:
+            entries = self._load()
+            if entries.get(key) == content:
+                return
+            entries[key] = content
+            append_jsonl(self.path, [{"key": key, "content": content}])
+
+
+DEFAULT_SYSTEM_PROMPT = "You are a precise information extractor. Return JSON only."
+
+_RATE_LIMITER = _RateLimiter(DEFAULT_DEEPSEEK_MAX_RPS)
+_RESPONSE_CACHE = _ResponseCache(DEEPSEEK_CACHE_JSONL)
+
+
+def set_response_cache_refresh(refresh: bool) -> None:
+    _RESPONSE_CACHE.refresh = refresh
+
+
+def _is_cacheable_reply(text: str) -> bool:
+    return bool(parse_json_obj(text) or parse_json_list(text))
+
+
+def _server_wait_hint(response: Optional["requests.Response"]) -> float:
+    if response is None:
+        return 0.0
+    for header in ("Retry-After", "X-RateLimit-Reset"):
+        value = str(response.headers.get(header, "") or "").strip()
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        if seconds > 1e9:
+            seconds -= time.time()
+        return max(0.0, seconds)
+    return 0.0
+
+
+def _backoff_seconds(attempt: int, response: Optional["requests.Response"] = None) -> float:
+    backoff = 2 ** (attempt - 1) + random.uniform(0, 1)
+    return min(60.0, max(_server_wait_hint(response), backoff))
+
+
+@lru_cache(maxsize=1)
+def _shared_session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def _load_env_file_if_needed() -> None:
+    if os.getenv("DEEPSEEK_API_KEY", "").strip():
+        return
+    root = Path(__file__).resolve().parents[2]
+    env_path = root / ".env"
+    if not env_path.exists():
+        return
+    for raw_line in env_path.read_text(encoding="utf-8").splitlines():
+        line = raw_line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key = key.strip()
+        value = value.strip().strip('"').strip("'")
+        if key and key not in os.environ:
+            os.environ[key] = value
 
 
 class DeepSeekClient:
@@ -19,39 +156,36 @@ class DeepSeekClient:
         timeout: int = 60,
         max_retries: int = 4,
     ) -> None:
-        self._load_env_file_if_needed()
+        _load_env_file_if_needed()
         self.api_key = api_key or os.getenv("DEEPSEEK_API_KEY", "").strip()
         self.endpoint = endpoint
         self.model = model
         self.timeout = timeout
         self.max_retries = max_retries
-        self.session = requests.Session()
 
-    @staticmethod
-    def _load_env_file_if_needed() -> None:
-        if os.getenv("DEEPSEEK_API_KEY", "").strip():
-            return
-        root = Path(__file__).resolve().parents[2]
-        env_path = root / ".env"
-        if not env_path.exists():
-            return
-        for raw_line in env_path.read_text(encoding="utf-8").splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            if key and key not in os.environ:
-                os.environ[key] = value
+    @property
+    def session(self) -> "requests.Session":
+        return _shared_session()
 
     @property
     def enabled(self) -> bool:
         return bool(self.api_key)
 
-    def chat_json(self, prompt: str, temperature: float = 0.05) -> str:
+    def chat_json(
+        self,
+        prompt: str,
+        temperature: float = 0.05,
+        system: Optional[str] = None,
+        refresh: bool = False,
+    ) -> str:
         if not self.enabled:
             raise RuntimeError("DEEPSEEK_API_KEY is not configured")
+        from requests import HTTPError
+
+        cache_key = _ResponseCache.key(self.model, temperature, prompt, system)
+        cached = None if refresh else _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
 
         payload: Dict[str, object] = {
             "model": self.model,
@@ -59,7 +193,7 @@ class DeepSeekClient:
             "messages": [
                 {
                     "role": "system",
-                    "content": "You are a precise information extractor. Return JSON only.",
+                    "content": system or DEFAULT_SYSTEM_PROMPT,
                 },
                 {"role": "user", "content": prompt},
             ],
@@ -72,6 +206,7 @@ class DeepSeekClient:
         last_error: Optional[Exception] = None
         for attempt in range(1, self.max_retries + 1):
             try:
+                _RATE_LIMITER.acquire()
                 response = self.session.post(
                     self.endpoint,
                     headers=headers,
@@ -82,8 +217,9 @@ class DeepSeekClient:
                     response.raise_for_status()
 
                 if response.status_code in (429, 408):
-                    wait_seconds = min(12, 2 * attempt)
-                    time.sleep(wait_seconds)
+                    last_error = RuntimeError(f"DeepSeek HTTP {response.status_code}")
+                    if attempt < self.max_retries:
+                        time.sleep(_backoff_seconds(attempt, response))
                     continue
 
                 response.raise_for_status()
@@ -99,10 +235,22 @@ class DeepSeekClient:
                         for part in content
                         if isinstance(part, dict) and part.get("type") == "text"
                     ]
-                    return "\n".join(text_parts).strip()
-                return str(content or "").strip()
+                    text = "\n".join(text_parts).strip()
+                else:
+                    text = str(content or "").strip()
+                if _is_cacheable_reply(text):
+                    _RESPONSE_CACHE.put(cache_key, text)
+                return text
+            except HTTPError as exc:
+                last_error = exc
+                status = exc.response.status_code if exc.response is not None else 0
+                if status < 500:
+                    break
+                if attempt < self.max_retries:
+                    time.sleep(_backoff_seconds(attempt))
             except Exception as exc:
                 last_error = exc
-                time.sleep(min(10, 1.5 * attempt))
+                if attempt < self.max_retries:
+                    time.sleep(_backoff_seconds(attempt))
 
         raise RuntimeError(f"DeepSeek call failed after retries: {last_error}")
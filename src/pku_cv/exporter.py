@@ -1,27 +1,23 @@
 from __future__ import annotations
 
-from typing import Dict, List
+import importlib.util
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
 from .config import FINAL_OUTPUT_CSV, NORMALIZED_JSONL, PROFESSORS_TEMPLATE_CSV
-from .utils import read_csv_header, read_csv_rows, read_jsonl, today_str, write_csv
+from .utils import ensure_dir, read_csv_header, read_csv_rows, read_jsonl, today_str, write_csv
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def _row_key(row: Dict[str, object]) -> str:
-    return "|".join(
-        [
-            str(row.get("department_name_zh", "")).strip(),
-            str(row.get("school_name_zh", "")).strip(),
-            str(row.get("name_zh", "")).strip(),
-            str(row.get("name_en", "")).strip(),
-        ]
-    )
+KEY_FIELDS = ["department_name_zh", "school_name_zh", "name_zh", "name_en"]
 
 
-def run() -> None:
-    headers = read_csv_header(PROFESSORS_TEMPLATE_CSV)
-    records = read_jsonl(NORMALIZED_JSONL)
+def _row_key(row: Dict[str, object]) -> Tuple[str, ...]:
+    return tuple(str(row.get(field, "")).strip() for field in KEY_FIELDS)
+
 
-    merged_map: Dict[str, Dict[str, object]] = {}
+def _merge_rows(headers: List[str], records: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    merged_map: Dict[Tuple[str, ...], Dict[str, object]] = {}
 
     if FINAL_OUTPUT_CSV.exists():
         for row in read_csv_rows(FINAL_OUTPUT_CSV):
@@ -34,10 +30,48 @@ def run() -> None:
             mapped["crawl_date"] = today_str()
         merged_map[_row_key(mapped)] = mapped
 
-    output_rows: List[Dict[str, object]] = list(merged_map.values())
+    return list(merged_map.values())
+
+
+def _merge_frames(headers: List[str], records: List[Dict[str, object]]) -> "pd.DataFrame":
+    import pandas as pd
+
+    frames = []
+    if FINAL_OUTPUT_CSV.exists():
+        existing = pd.read_csv(FINAL_OUTPUT_CSV, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+        existing = existing.rename(columns=lambda col: str(col).strip())
+        frames.append(existing.reindex(columns=headers, fill_value="").apply(lambda col: col.str.strip()))
+
+    incoming = pd.DataFrame(records, dtype=object).reindex(columns=headers)
+    incoming = incoming.where(incoming.notna(), "").astype(str)
+    if "crawl_date" in headers:
+        incoming.loc[incoming["crawl_date"] == "", "crawl_date"] = today_str()
+    frames.append(incoming)
+
+    merged = pd.concat(frames, ignore_index=True)
+    keys = merged.reindex(columns=KEY_FIELDS, fill_value="").apply(lambda col: col.str.strip())
+    merged.index = pd.MultiIndex.from_frame(keys)
+    latest = merged[~merged.index.duplicated(keep="last")]
+    return latest.reindex(merged.index.unique()).reset_index(drop=True)
+
+
+def run() -> None:
+    headers = read_csv_header(PROFESSORS_TEMPLATE_CSV)
+    records = read_jsonl(NORMALIZED_JSONL)
+
+    if importlib.util.find_spec("pandas") is None:
+        output_rows = _merge_rows(headers, records)
+        write_csv(FINAL_OUTPUT_CSV, headers, output_rows)
+        row_count = len(output_rows)
+    else:
+        output_frame = _merge_frames(headers, records)
+        ensure_dir(FINAL_OUTPUT_CSV.parent)
+        output_frame.to_csv(
+            FINAL_OUTPUT_CSV, columns=headers, index=False, encoding="utf-8-sig", lineterminator="\r\n"
+        )
+        row_count = len(output_frame)
 
-    write_csv(FINAL_OUTPUT_CSV, headers, output_rows)
-    print(f"Export finished: rows={len(output_rows)} -> {FINAL_OUTPUT_CSV}")
+    print(f"Export finished: rows={row_count} -> {FINAL_OUTPUT_CSV}")
 
 
 if __name__ == "__main__":
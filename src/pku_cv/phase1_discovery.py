@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import re
+import zlib
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple, Union
 from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 
-import requests
-from bs4 import BeautifulSoup
-
 from .config import (
+    CANDIDATE_PAIRS_CACHE_JSONL,
     DEFAULT_MAX_PAGES,
     DEFAULT_TIMEOUT_SECONDS,
     LISTING_PAGES_JSONL,
@@ -22,16 +25,22 @@ from .config import (
 )
 from .deepseek_client import DeepSeekClient
 from .utils import (
+    HTML_PARSER,
+    append_jsonl,
     ensure_dir,
+    iter_jsonl,
     parse_json_list,
     read_csv_rows,
-    read_jsonl,
     safe_slug,
     today_str,
     validate_seed_rows,
     write_jsonl,
 )
 
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+
 try:
     from playwright.sync_api import sync_playwright  # type: ignore
 
@@ -43,47 +52,59 @@ except Exception:
 
 ZH_NAME_RE = re.compile(r"^[\u4e00-\u9fff]{2,4}$")
 EN_WORD_RE = re.compile(r"^[A-Za-z][A-Za-z\-'.]*$")
-STOPWORDS = {
-    "导航",
-    "门户",
-    "概况",
-    "简介",
-    "历史",
-    "学院",
-    "新闻",
-    "公告",
-    "招生",
-    "校友",
-    "联系",
-    "首页",
-    "教研人员",
-    "教师队伍",
-    "快速",
-    "主页",
-    "北大",
-    "网络",
-    "课题组",
-    "组长",
-    "在职",
-    "教师",
-}
-EN_STOPWORDS = {
-    "home",
-    "portal",
-    "about",
-    "overview",
-    "news",
-    "notice",
-    "admission",
-    "alumni",
-    "contact",
-    "faculty",
-    "teacher",
-    "staff",
-    "research",
-    "group",
-    "navigation",
-}
+STOPWORDS = frozenset(
+    {
+        "导航",
+        "门户",
+        "概况",
+        "简介",
+        "历史",
+        "学院",
+        "新闻",
+        "公告",
+        "招生",
+        "校友",
+        "联系",
+        "首页",
+        "教研人员",
+        "教师队伍",
+        "快速",
+        "主页",
+        "北大",
+        "网络",
+        "课题组",
+        "组长",
+        "在职",
+        "教师",
+    }
+)
+EN_STOPWORDS = frozenset(
+    {
+        "home",
+        "portal",
+        "about",
+        "overview",
+        "news",
+        "notice",
+        "admission",
+        "alumni",
+        "contact",
+        "faculty",
+        "teacher",
+        "staff",
+        "research",
+        "group",
+        "navigation",
+    }
+)
+STOPWORD_RE = re.compile("|".join(map(re.escape, STOPWORDS)))
+WS_RE = re.compile(r"\s+")
+TOKEN_SEPARATORS = r"\s,，。；;：:、|/()（）\[\]<>《》‘’“”\-"
+# Chinese names must fill a whole separator-delimited token; English names are capitalised runs.
+TEXT_CANDIDATE_RE = re.compile(
+    rf"(?<![^{TOKEN_SEPARATORS}])[\u4e00-\u9fff]{{2,4}}(?![^{TOKEN_SEPARATORS}])"
+    r"|\b[A-Z][A-Za-z\-'.]*(?:\s+[A-Z][A-Za-z\-'.]*){0,2}\b"
+)
 JS_URL_RE = re.compile(r"(?:window\.location(?:\.href)?|location\.href|open)\s*\(??\s*['\"]([^'\"]+)['\"]")
 QUOTED_URL_RE = re.compile(r"['\"]((?:https?://|/|\.\./|\./)[^'\"\s<>]+)['\"]")
 PROFILE_LINK_TEXT_HINTS = {
@@ -127,24 +148,40 @@ RENDERED_NAME_SELECTORS = [
     "li:has(.js-name)",
 ]
 UNRENDERED_TEMPLATE_MARKERS = ["{{:name}}", "{{:url}}", "Tsites_advance_search"]
+CANDIDATE_BUCKETS = 8
+CANDIDATE_PAIRS_EXTRACTOR_VERSION = 1
+
+
+_CANDIDATE_PAIRS_CACHE_REFRESH = False
+
+
+def set_candidate_pairs_cache_refresh(refresh: bool) -> None:
+    global _CANDIDATE_PAIRS_CACHE_REFRESH
+    _CANDIDATE_PAIRS_CACHE_REFRESH = refresh
+
+
+def _content_hash(html: Union[str, bytes]) -> str:
+    data = html.encode("utf-8") if isinstance(html, str) else html
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 def _normalize_token(token: str) -> str:
-    token = re.sub(r"\s+", " ", token.strip())
-    return token
+    return WS_RE.sub(" ", token.strip())
 
 
+@lru_cache(maxsize=200_000)
 def _is_zh_name(token: str) -> bool:
     token = token.strip()
     if not ZH_NAME_RE.match(token):
         return False
     if token in STOPWORDS:
         return False
-    if any(word in token for word in STOPWORDS):
+    if STOPWORD_RE.search(token):
         return False
     return True
 
 
+@lru_cache(maxsize=200_000)
 def _is_en_name(token: str) -> bool:
     token = _normalize_token(token)
     if not token:
@@ -170,17 +207,18 @@ def _is_en_name(token: str) -> bool:
     lower = token.lower()
     if lower in EN_STOPWORDS:
         return False
-    lower_words = set(lower.split(" "))
-    if any(stop in lower_words for stop in EN_STOPWORDS):
+    if not EN_STOPWORDS.isdisjoint(lower.split(" ")):
         return False
     return True
 
 
+@lru_cache(maxsize=200_000)
 def _looks_like_name(token: str) -> bool:
     token = _normalize_token(token)
     return _is_zh_name(token) or _is_en_name(token)
 
 
+@lru_cache(maxsize=200_000)
 def _name_type(token: str) -> str:
     token = token.strip()
     if _is_zh_name(token):
@@ -297,9 +335,12 @@ def _find_profile_url_for_name(soup: BeautifulSoup, name: str, page_url: str) ->
     return ""
 
 
-def _collect_candidate_pairs(html: str, page_url: str) -> List[Tuple[str, str]]:
-    soup = BeautifulSoup(html, "html.parser")
-    pairs: List[Tuple[str, str]] = []
+def _collect_candidate_pairs(html: Union[str, bytes], page_url: str) -> List[Tuple[str, str]]:
+    from bs4 import BeautifulSoup
+
+    # Saved pages are always UTF-8, whatever charset their <meta> tag still declares.
+    soup = BeautifulSoup(html, HTML_PARSER, from_encoding="utf-8" if isinstance(html, bytes) else None)
+    dedup_map: Dict[str, str] = {}
 
     for anchor in soup.find_all("a"):
         text = _normalize_token(anchor.get_text() or "")
@@ -307,23 +348,14 @@ def _collect_candidate_pairs(html: str, page_url: str) -> List[Tuple[str, str]]:
         if not _looks_like_name(text):
             continue
         profile_url = urljoin(page_url, href) if href else ""
-        pairs.append((text, profile_url))
+        if text not in dedup_map or (not dedup_map[text] and profile_url):
+            dedup_map[text] = profile_url
 
     raw_text = soup.get_text(" ", strip=True)
-    for token in re.split(r"[\s,，。；;：:、|/()（）\[\]<>《》‘’“”\-]+", raw_text):
-        token = _normalize_token(token)
-        if _looks_like_name(token):
-            pairs.append((token, ""))
-
-    for match in re.finditer(r"\b[A-Z][A-Za-z\-'.]*(?:\s+[A-Z][A-Za-z\-'.]*){0,2}\b", raw_text):
+    for match in TEXT_CANDIDATE_RE.finditer(raw_text):
         token = _normalize_token(match.group(0))
-        if _looks_like_name(token):
-            pairs.append((token, ""))
-
-    dedup_map: Dict[str, str] = {}
-    for name, profile_url in pairs:
-        if name not in dedup_map or (not dedup_map[name] and profile_url):
-            dedup_map[name] = profile_url
+        if token not in dedup_map and _looks_like_name(token):
+            dedup_map[token] = ""
 
     for name in list(dedup_map.keys()):
         if dedup_map[name]:
@@ -331,12 +363,7 @@ def _collect_candidate_pairs(html: str, page_url: str) -> List[Tuple[str, str]]:
         profile_url = _find_profile_url_for_name(soup, name, page_url)
         if profile_url:
             dedup_map[name] = profile_url
-    return sorted(dedup_map.items(), key=lambda item: item[0])
-
-
-def _extract_signature(html: str) -> str:
-    names = [name for name, _ in _collect_candidate_pairs(html, "")]
-    return "|".join(names[:20])
+    return list(dedup_map.items())
 
 
 def _set_query_param(url: str, key: str, value: str) -> str:
@@ -360,6 +387,27 @@ def _render_queryteacher_html(teacher_data: List[Dict[str, object]]) -> str:
     return "\n".join(rows)
 
 
+@lru_cache(maxsize=1)
+def _http_session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+            ),
+        }
+    )
+    return session
+
+
 def _discover_with_queryteacher_api(
     query_url: str,
     start_url: str,
@@ -370,7 +418,7 @@ def _discover_with_queryteacher_api(
     timeout: int,
 ) -> List[Dict[str, object]]:
     rows: List[Dict[str, object]] = []
-    session = requests.Session()
+    session = _http_session()
 
     first_url = _set_query_param(query_url, "pageindex", "1")
     response = session.get(first_url, timeout=timeout)
@@ -405,6 +453,7 @@ def _discover_with_queryteacher_api(
                 "page_index": page_index,
                 "seed_row_index": seed_row_index,
                 "html_path": str(html_path),
+                "content_hash": _content_hash(html),
                 "crawl_date": today_str(),
             }
         )
@@ -556,7 +605,27 @@ def _click_next_and_wait_change(page: Any, previous_signature: str, timeout_ms:
     return bool(current_signature and current_signature != previous_signature)
 
 
+def _launch_browser(p: Any) -> Any:
+    headless = os.getenv("PLAYWRIGHT_HEADLESS", "1").strip() != "0"
+    launch_errors: List[str] = []
+    try:
+        return p.chromium.launch(channel="chrome", headless=headless)
+    except Exception as exc:
+        launch_errors.append(f"system chrome launch failed: {exc}")
+    try:
+        return p.chromium.launch(headless=headless)
+    except Exception as exc:
+        launch_errors.append(f"bundled chromium launch failed: {exc}")
+        raise RuntimeError(
+            "Playwright browser launch failed. "
+            "Tried system Chrome first, then bundled Chromium. "
+            "Install Chrome or run 'python -m playwright install chromium'. "
+            f"Details: {' | '.join(launch_errors)}"
+        )
+
+
 def _discover_with_playwright(
+    browser: Any,
     start_url: str,
     department_name_zh: str,
     school_name_zh: str,
@@ -565,29 +634,10 @@ def _discover_with_playwright(
     timeout: int,
 ) -> List[Dict[str, object]]:
     rows: List[Dict[str, object]] = []
-    headless = os.getenv("PLAYWRIGHT_HEADLESS", "1").strip() != "0"
     queryteacher_urls: List[str] = []
 
-    with sync_playwright() as p:  # type: ignore[misc]
-        browser = None
-        launch_errors: List[str] = []
-        try:
-            browser = p.chromium.launch(channel="chrome", headless=headless)
-        except Exception as exc:
-            launch_errors.append(f"system chrome launch failed: {exc}")
-        if browser is None:
-            try:
-                browser = p.chromium.launch(headless=headless)
-            except Exception as exc:
-                launch_errors.append(f"bundled chromium launch failed: {exc}")
-                raise RuntimeError(
-                    "Playwright browser launch failed. "
-                    "Tried system Chrome first, then bundled Chromium. "
-                    "Install Chrome or run 'python -m playwright install chromium'. "
-                    f"Details: {' | '.join(launch_errors)}"
-                )
-
-        context = browser.new_context()
+    context = browser.new_context()
+    try:
         page = context.new_page()
         page.route(
             "**/*",
@@ -610,8 +660,6 @@ def _discover_with_playwright(
             elapsed += 200
 
         if queryteacher_urls: ## some sites(especially physics department) loads stuff via queryteacher.jsp. So special handling for that.
-            context.close()
-            browser.close()
             query_url = queryteacher_urls[-1]
             return _discover_with_queryteacher_api(
                 query_url=query_url,
@@ -624,8 +672,6 @@ def _discover_with_playwright(
             )
 
         if not _wait_for_rendered_name_nodes(page, timeout_ms=timeout * 1000):
-            context.close()
-            browser.close()
             raise RuntimeError(f"Playwright loaded but no rendered teacher nodes found for: {start_url}")
 
         last_signature = ""
@@ -634,14 +680,13 @@ def _discover_with_playwright(
         for page_index in range(1, max_pages_per_seed + 1):
             html = page.content()
             if _html_looks_unrendered(html):
-                context.close()
-                browser.close()
                 raise RuntimeError(
                     f"Detected unrendered template HTML on page {page_index} for: {page.url}"
                 )
             slug = safe_slug(f"{school_name_zh}-{seed_row_index}-{page_index}")
             html_path = PAGES_DIR / f"{slug}.html"
             html_path.write_text(html, encoding="utf-8")
+            signature = _content_hash(html)
 
             rows.append(
                 {
@@ -652,12 +697,12 @@ def _discover_with_playwright(
                     "page_index": page_index,
                     "seed_row_index": seed_row_index,
                     "html_path": str(html_path),
+                    "content_hash": signature,
                     "crawl_date": today_str(),
                 }
             )
 
-            signature = _extract_signature(html)
-            if signature and signature == last_signature:
+            if signature == last_signature:
                 repeat_count += 1
             else:
                 repeat_count = 0
@@ -666,22 +711,50 @@ def _discover_with_playwright(
             if repeat_count >= 2:
                 break
 
-            if not _click_next_and_wait_change(page, previous_signature=signature, timeout_ms=timeout * 1000):
+            name_signature = _extract_signature_from_page(page)
+            if not _click_next_and_wait_change(page, previous_signature=name_signature, timeout_ms=timeout * 1000):
                 break
 
             if not _wait_for_rendered_name_nodes(page, timeout_ms=timeout * 1000):
-                context.close()
-                browser.close()
                 raise RuntimeError(f"After clicking next, no rendered teacher nodes for: {page.url}")
-
+    finally:
         context.close()
-        browser.close()
 
     return rows
 
 
+def _discover_seeds_with_playwright(
+    seeds: List[Dict[str, object]],
+) -> Tuple[Dict[int, List[Dict[str, object]]], List[Dict[str, object]]]:
+    rows_by_seed: Dict[int, List[Dict[str, object]]] = {}
+    failed_seeds: List[Dict[str, object]] = []
+
+    with ExitStack() as stack:
+        try:
+            p = stack.enter_context(sync_playwright())  # type: ignore[misc]
+            browser = _launch_browser(p)
+        except Exception as exc:
+            print(f"Phase1 Playwright browser unavailable: {exc}. Falling back to requests.")
+            return {}, list(seeds)
+        stack.callback(browser.close)
+
+        for seed in seeds:
+            try:
+                rows_by_seed[int(seed["seed_row_index"])] = _discover_with_playwright(browser, **seed)
+            except Exception as exc:
+                print(
+                    f"Phase1 Playwright discovery failed for {seed['school_name_zh']}: {exc}. "
+                    "Falling back to requests."
+                )
+                failed_seeds.append(seed)
+
+    return rows_by_seed, failed_seeds
+
+
 def _find_next_url(current_url: str, html: str) -> Optional[str]:
-    soup = BeautifulSoup(html, "html.parser")
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, HTML_PARSER)
     for anchor in soup.find_all("a"):
         text = (anchor.get_text() or "").strip().lower()
         href = (anchor.get("href") or "").strip()
@@ -701,7 +774,7 @@ def _discover_with_requests(
     timeout: int,
 ) -> List[Dict[str, object]]:
     rows: List[Dict[str, object]] = []
-    session = requests.Session()
+    session = _http_session()
     visited: Set[str] = set()
     current_url = start_url
 
@@ -728,6 +801,7 @@ def _discover_with_requests(
                 "page_index": page_index,
                 "seed_row_index": seed_row_index,
                 "html_path": str(html_path),
+                "content_hash": _content_hash(html),
                 "crawl_date": today_str(),
             }
         )
@@ -740,11 +814,50 @@ def _discover_with_requests(
     return rows
 
 
+def _bucket_candidates(names: List[str], batch_size: int) -> List[List[str]]:
+    # A fixed bucket count keeps each name's bucket, and so its batch prompt and
+    # cached response, stable across runs. Changing it invalidates every cached batch.
+    buckets: Dict[int, List[str]] = defaultdict(list)
+    for name in sorted(set(names)):
+        buckets[zlib.crc32(name.encode("utf-8")) % CANDIDATE_BUCKETS].append(name)
+    batches: List[List[str]] = []
+    for index in sorted(buckets):
+        bucket = buckets[index]
+        batches.extend(bucket[start : start + batch_size] for start in range(0, len(bucket), batch_size))
+    return batches
+
+
+def _filter_batch_with_deepseek(
+    school_name_zh: str,
+    department_name_zh: str,
+    batch: List[str],
+    client: DeepSeekClient,
+) -> List[str]:
+    prompt = (
+        "请从候选词中筛选‘真实教师姓名’，返回JSON数组。"
+        "只保留人名，剔除栏目词、职位词、页面导航词、学科词、机构词。"
+        "中文姓名一般2-4个汉字；英文姓名2-3词，且每个词应为首字母大写或全大写。"
+        f"\n院系: {department_name_zh}"
+        f"\n单位: {school_name_zh}"
+        "\n候选词列表: "
+        f"{batch}"
+        "\n仅输出JSON数组，例如: [\"张三\", \"Li Ming\"]"
+    )
+
+    try:
+        text = client.chat_json(prompt, temperature=0.0)
+        names = parse_json_list(text)
+        return [name for name in names if _looks_like_name(name)]
+    except Exception:
+        return list(batch)
+
+
 def _filter_names_with_deepseek(
     school_name_zh: str,
     department_name_zh: str,
     candidates: List[str],
     client: DeepSeekClient,
+    workers: int = 8,
 ) -> List[str]:
     if not candidates:
         return []
@@ -753,32 +866,74 @@ def _filter_names_with_deepseek(
     if not client.enabled:
         return sorted(set(deterministic))
 
+    batches = _bucket_candidates(deterministic, batch_size=60)
     selected: Set[str] = set()
-    batch_size = 60
-    for start in range(0, len(deterministic), batch_size):
-        batch = deterministic[start : start + batch_size]
-        prompt = (
-            "请从候选词中筛选‘真实教师姓名’，返回JSON数组。"
-            "只保留人名，剔除栏目词、职位词、页面导航词、学科词、机构词。"
-            "中文姓名一般2-4个汉字；英文姓名2-3词，且每个词应为首字母大写或全大写。"
-            f"\n院系: {department_name_zh}"
-            f"\n单位: {school_name_zh}"
-            "\n候选词列表: "
-            f"{batch}"
-            "\n仅输出JSON数组，例如: [\"张三\", \"Li Ming\"]"
-        )
-
-        try:
-            text = client.chat_json(prompt, temperature=0.0)
-            names = parse_json_list(text)
-            clean = [name for name in names if _looks_like_name(name)]
-            selected.update(clean)
-        except Exception:
-            selected.update(batch)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches) or 1))) as executor:
+        for names in executor.map(
+            lambda batch: _filter_batch_with_deepseek(school_name_zh, department_name_zh, batch, client),
+            batches,
+        ):
+            selected.update(names)
 
     return sorted(selected)
 
 
+RowKey = Tuple[str, ...]
+
+
+def _listing_key(row: Dict[str, object]) -> RowKey:
+    html_path = str(row.get("html_path") or "").strip()
+    if html_path:
+        return (html_path,)
+    return (
+        str(row.get("seed_row_index") or ""),
+        str(row.get("listing_page_url") or ""),
+        str(row.get("page_index") or ""),
+    )
+
+
+def _candidate_key(row: Dict[str, object]) -> RowKey:
+    return (
+        row.get("department_name_zh") or "",
+        row.get("school_name_zh") or "",
+        row.get("name_candidate") or "",
+        row.get("profile_url") or "",
+        row.get("listing_page_url") or "",
+    )
+
+
+def _professor_key(row: Dict[str, object]) -> RowKey:
+    return (
+        row.get("department_name_zh") or "",
+        row.get("school_name_zh") or "",
+        row.get("name_zh") or "",
+        row.get("name_en") or "",
+    )
+
+
+def _persist_new_rows(
+    path: Path,
+    existing_keys: Set[RowKey],
+    new_rows: List[Dict[str, object]],
+    key_fn: Callable[[Dict[str, object]], RowKey],
+    resume: bool,
+) -> Dict[RowKey, Dict[str, object]]:
+    new_map: Dict[RowKey, Dict[str, object]] = {}
+    for row in new_rows:
+        new_map[key_fn(row)] = row
+
+    if not resume:
+        write_jsonl(path, new_map.values())
+    elif existing_keys.isdisjoint(new_map):
+        append_jsonl(path, new_map.values())
+    else:
+        merged_map = {key_fn(row): row for row in iter_jsonl(path)}
+        merged_map.update(new_map)
+        write_jsonl(path, merged_map.values())
+    existing_keys.update(new_map)
+    return new_map
+
+
 def run(
     max_pages_per_seed: int = DEFAULT_MAX_PAGES,
     timeout: int = DEFAULT_TIMEOUT_SECONDS,
@@ -786,6 +941,7 @@ def run(
     seed_limit: Optional[int] = None,
     resume: bool = True,
     require_deepseek: bool = False,
+    fetch_workers: int = 8,
 ) -> None:
     ensure_dir(PAGES_DIR)
 
@@ -798,80 +954,89 @@ def run(
     if seed_limit is not None and seed_limit > 0:
         valid_rows = valid_rows[:seed_limit]
 
-    existing_listing_rows = read_jsonl(LISTING_PAGES_JSONL) if resume else []
+    existing_candidate_html_paths: Set[str] = set()
+    candidate_keys: Set[RowKey] = set()
+    if resume:
+        for row in iter_jsonl(NAME_CANDIDATES_JSONL):
+            candidate_keys.add(_candidate_key(row))
+            html_path = str(row.get("html_path") or "").strip()
+            if html_path:
+                existing_candidate_html_paths.add(html_path)
+
+    listing_keys: Set[RowKey] = set()
+    pending_listings: Dict[RowKey, Dict[str, object]] = {}
     processed_seed_indices: Set[int] = set()
-    for row in existing_listing_rows:
-        idx = row.get("seed_row_index")
-        if isinstance(idx, int):
-            processed_seed_indices.add(idx)
-        else:
-            try:
-                processed_seed_indices.add(int(str(idx)))
-            except Exception:
-                pass
+    if resume:
+        for row in iter_jsonl(LISTING_PAGES_JSONL):
+            listing_key = _listing_key(row)
+            listing_keys.add(listing_key)
+            if str(row.get("html_path") or "").strip() not in existing_candidate_html_paths:
+                pending_listings[listing_key] = row
+            idx = row.get("seed_row_index")
+            if isinstance(idx, int):
+                processed_seed_indices.add(idx)
+            else:
+                try:
+                    processed_seed_indices.add(int(str(idx)))
+                except Exception:
+                    pass
 
-    listing_rows_new: List[Dict[str, object]] = []
+    pending_seeds: List[Dict[str, object]] = []
     for local_index, seed in enumerate(valid_rows):
         seed_row_index = seed_start + local_index
         if resume and seed_row_index in processed_seed_indices:
             continue
 
-        department_name_zh = seed.get("department_name_zh", "").strip()
-        school_name_zh = seed.get("school_name_zh", "").strip()
         start_url = seed.get("faculty_list_url", "").strip()
-
         if not start_url:
             continue
 
-        if PLAYWRIGHT_AVAILABLE:
-            try:
-                rows = _discover_with_playwright(
-                    start_url=start_url,
-                    department_name_zh=department_name_zh,
-                    school_name_zh=school_name_zh,
-                    seed_row_index=seed_row_index,
-                    max_pages_per_seed=max_pages_per_seed,
-                    timeout=timeout,
-                )
-                listing_rows_new.extend(rows)
-                continue
-            except Exception as exc:
-                print(f"Phase1 Playwright discovery failed for {school_name_zh}: {exc}. Falling back to requests.")
-
-        rows = _discover_with_requests(
-            start_url=start_url,
-            department_name_zh=department_name_zh,
-            school_name_zh=school_name_zh,
-            seed_row_index=seed_row_index,
-            max_pages_per_seed=max_pages_per_seed,
-            timeout=timeout,
+        pending_seeds.append(
+            {
+                "start_url": start_url,
+                "department_name_zh": seed.get("department_name_zh", "").strip(),
+                "school_name_zh": seed.get("school_name_zh", "").strip(),
+                "seed_row_index": seed_row_index,
+                "max_pages_per_seed": max_pages_per_seed,
+                "timeout": timeout,
+            }
         )
-        listing_rows_new.extend(rows)
-
-    merged_listing_map: Dict[str, Dict[str, object]] = {}
-    for row in existing_listing_rows + listing_rows_new:
-        key = str(row.get("html_path") or "").strip()
-        if not key:
-            key = "|".join(
-                [
-                    str(row.get("seed_row_index") or ""),
-                    str(row.get("listing_page_url") or ""),
-                    str(row.get("page_index") or ""),
-                ]
-            )
-        merged_listing_map[key] = row
-    listing_rows = list(merged_listing_map.values())
 
-    write_jsonl(LISTING_PAGES_JSONL, listing_rows)
+    rows_by_seed: Dict[int, List[Dict[str, object]]] = {}
+    requests_seeds = pending_seeds
+    if PLAYWRIGHT_AVAILABLE and pending_seeds:
+        rows_by_seed, requests_seeds = _discover_seeds_with_playwright(pending_seeds)
 
-    existing_candidate_rows = read_jsonl(NAME_CANDIDATES_JSONL) if resume else []
-    existing_candidate_html_paths = {
-        str(row.get("html_path") or "").strip() for row in existing_candidate_rows if row.get("html_path")
-    }
+    if requests_seeds:
+        with ThreadPoolExecutor(max_workers=max(1, min(fetch_workers, len(requests_seeds)))) as executor:
+            future_map = {
+                executor.submit(_discover_with_requests, **kwargs): int(kwargs["seed_row_index"])
+                for kwargs in requests_seeds
+            }
+            for future, seed_row_index in future_map.items():
+                rows_by_seed[seed_row_index] = future.result()
+
+    listing_rows_new: List[Dict[str, object]] = []
+    for seed_row_index in sorted(rows_by_seed):
+        listing_rows_new.extend(rows_by_seed[seed_row_index])
+
+    pending_listings.update(
+        _persist_new_rows(LISTING_PAGES_JSONL, listing_keys, listing_rows_new, _listing_key, resume)
+    )
 
     candidate_rows_new: List[Dict[str, object]] = []
+    pairs_cache: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+    if resume and not _CANDIDATE_PAIRS_CACHE_REFRESH:
+        pairs_cache = {
+            (str(row.get("content_hash") or ""), str(row.get("listing_page_url") or "")): [
+                (str(name), str(url)) for name, url in row.get("pairs") or []
+            ]
+            for row in iter_jsonl(CANDIDATE_PAIRS_CACHE_JSONL)
+            if row.get("extractor_version") == CANDIDATE_PAIRS_EXTRACTOR_VERSION
+        }
+    pairs_cache_new: List[Dict[str, object]] = []
 
-    for listing in listing_rows:
+    for listing in pending_listings.values():
         html_path = str(listing.get("html_path") or "").strip()
         listing_url = str(listing.get("listing_page_url") or "").strip()
         if not html_path:
@@ -879,12 +1044,26 @@ def run(
         if resume and html_path in existing_candidate_html_paths:
             continue
 
-        try:
-            content = Path(html_path).read_text(encoding="utf-8")
-        except Exception:
-            continue
-
-        pairs = _collect_candidate_pairs(content, listing_url)
+        content_hash = str(listing.get("content_hash") or "").strip()
+        pairs = pairs_cache.get((content_hash, listing_url)) if content_hash else None
+        if pairs is None:
+            try:
+                content = Path(html_path).read_bytes()
+            except Exception:
+                continue
+            content_hash = _content_hash(content)
+            pairs = pairs_cache.get((content_hash, listing_url))
+            if pairs is None:
+                pairs = _collect_candidate_pairs(content, listing_url)
+                pairs_cache[(content_hash, listing_url)] = pairs
+                pairs_cache_new.append(
+                    {
+                        "extractor_version": CANDIDATE_PAIRS_EXTRACTOR_VERSION,
+                        "content_hash": content_hash,
+                        "listing_page_url": listing_url,
+                        "pairs": [list(pair) for pair in pairs],
+                    }
+                )
         department_name_zh = str(listing.get("department_name_zh") or "")
         school_name_zh = str(listing.get("school_name_zh") or "")
         key = (department_name_zh, school_name_zh)
@@ -903,23 +1082,11 @@ def run(
                 }
             )
 
-    candidate_merged_map: Dict[str, Dict[str, object]] = {}
-    for row in existing_candidate_rows + candidate_rows_new:
-        key = "|".join(
-            [
-                str(row.get("department_name_zh") or ""),
-                str(row.get("school_name_zh") or ""),
-                str(row.get("name_candidate") or ""),
-                str(row.get("profile_url") or ""),
-                str(row.get("listing_page_url") or ""),
-            ]
-        )
-        candidate_merged_map[key] = row
-    candidate_rows = list(candidate_merged_map.values())
-    write_jsonl(NAME_CANDIDATES_JSONL, candidate_rows)
+    append_jsonl(CANDIDATE_PAIRS_CACHE_JSONL, pairs_cache_new)
+    _persist_new_rows(NAME_CANDIDATES_JSONL, candidate_keys, candidate_rows_new, _candidate_key, resume)
 
     school_candidates: Dict[Tuple[str, str], Dict[str, str]] = defaultdict(dict)
-    for row in candidate_rows:
+    for row in iter_jsonl(NAME_CANDIDATES_JSONL):
         key = (
             str(row.get("department_name_zh") or ""),
             str(row.get("school_name_zh") or ""),
@@ -936,9 +1103,10 @@ def run(
             "Phase1 DeepSeek filtering is required but DEEPSEEK_API_KEY is missing. "
             "Set it in .env or environment variables."
         )
-    existing_professor_rows = read_jsonl(PROFESSOR_NAMES_JSONL) if resume else []
+    professor_keys: Set[RowKey] = set()
     existing_by_school: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
-    for row in existing_professor_rows:
+    for row in iter_jsonl(PROFESSOR_NAMES_JSONL) if resume else []:
+        professor_keys.add(_professor_key(row))
         key = (
             str(row.get("department_name_zh") or ""),
             str(row.get("school_name_zh") or ""),
@@ -952,7 +1120,7 @@ def run(
 
     professor_rows_new: List[Dict[str, object]] = []
     for (department_name_zh, school_name_zh), candidate_map in school_candidates.items():
-        all_candidates = sorted(candidate_map.keys())
+        all_candidates = sorted(candidate_map)
         existing_names = existing_by_school[(department_name_zh, school_name_zh)] if resume else set()
         candidates = [name for name in all_candidates if name not in existing_names]
         if not candidates:
@@ -979,25 +1147,22 @@ def run(
                 }
             )
 
-    dedup: Dict[str, Dict[str, object]] = {}
-    for row in existing_professor_rows + professor_rows_new:
-        key = "|".join(
-            [
-                str(row.get("department_name_zh") or ""),
-                str(row.get("school_name_zh") or ""),
-                str(row.get("name_zh") or ""),
-                str(row.get("name_en") or ""),
-            ]
-        )
-        if key not in dedup:
-            dedup[key] = row
-
-    write_jsonl(PROFESSOR_NAMES_JSONL, list(dedup.values()))
+    professor_rows_added: Dict[RowKey, Dict[str, object]] = {}
+    for row in professor_rows_new:
+        key = _professor_key(row)
+        if key not in professor_keys:
+            professor_rows_added.setdefault(key, row)
+    professor_keys.update(professor_rows_added)
+
+    if resume:
+        append_jsonl(PROFESSOR_NAMES_JSONL, professor_rows_added.values())
+    else:
+        write_jsonl(PROFESSOR_NAMES_JSONL, professor_rows_added.values())
     print(
         "Phase1 finished: "
-        f"new_pages={len(listing_rows_new)}, total_pages={len(listing_rows)}, "
-        f"new_candidates={len(candidate_rows_new)}, total_candidates={len(candidate_rows)}, "
-        f"new_names={len(professor_rows_new)}, total_names={len(dedup)}"
+        f"new_pages={len(listing_rows_new)}, total_pages={len(listing_keys)}, "
+        f"new_candidates={len(candidate_rows_new)}, total_candidates={len(candidate_keys)}, "
+        f"new_names={len(professor_rows_new)}, total_names={len(professor_keys)}"
     )
 
 
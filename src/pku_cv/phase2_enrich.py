@@ -1,16 +1,45 @@
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+import hashlib
+import itertools
+import json
+import os
+import random
 import re
-from typing import Dict, List, Optional, Set, Tuple
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
 from bs4 import BeautifulSoup
 
-from .config import ENRICHED_JSONL, PROFESSOR_NAMES_JSONL
+from .config import (
+    DEFAULT_PROFILE_CACHE_TTL_DAYS,
+    ENRICHED_JSONL,
+    PROFESSOR_NAMES_JSONL,
+    PROFILE_HTML_CACHE_DIR,
+)
 from .deepseek_client import DeepSeekClient
-from .utils import parse_json_obj, read_jsonl, today_str, write_jsonl
+from .utils import (
+    ENRICHED_KEY_FIELDS,
+    HTML_PARSER,
+    SEARCH_PENDING_STATUS,
+    append_jsonl,
+    enriched_row_key,
+    ensure_dir,
+    iter_jsonl,
+    parse_json_obj,
+    parse_json_obj_list,
+    today_str,
+    write_jsonl,
+)
 
 
 PROFILE_LINK_HINTS = [
@@ -26,6 +55,55 @@ PROFILE_LINK_HINTS = [
     "resume",
     "profile",
 ]
+PROFILE_HINT_RE = re.compile("|".join(re.escape(hint) for hint in PROFILE_LINK_HINTS))
+PROFILE_SCORE_RE = re.compile(r"(?P<home>个人主页|homepage)|(?P<cv>简历|cv|resume)|(?P<detail>详细|详情|profile)")
+PROFILE_SCORE_WEIGHTS = {"home": 5, "cv": 4, "detail": 2}
+YEAR_RE = re.compile(r"\b(19\d{2}|20\d{2})\b")
+MULTI_NEWLINE_RE = re.compile(r"\n{2,}")
+JOIN_YEAR_RE = re.compile(
+    r"(19\d{2}|20\d{2})\s*年[^\n。；;]{0,12}?(?:加入|入职|受聘于|任职于|就职于|调入)\s*北京大学"
+)
+COUNTRY_PREFIX = r"(?:美国|英国|德国|法国|日本|韩国|加拿大|澳大利亚|新加坡|瑞士|瑞典|荷兰|意大利|以色列|中国香港|香港)?"
+SCHOOL_CAPTURE = (
+    r"(?:于|在)\s*" + COUNTRY_PREFIX + r"\s*"
+    r"((?:(?![于在获]|期间)[\u4e00-\u9fffA-Za-z .&'-]){0,28}(?:大学|学院|研究所|研究院|分校|University|Institute))"
+)
+DEGREE_LINK = r"[^\n。；;于在]{0,20}?获得?[^\n。；;，,]{0,6}?"
+PHD_SCHOOL_RE = re.compile(SCHOOL_CAPTURE + DEGREE_LINK + "博士学位")
+BS_SCHOOL_RE = re.compile(SCHOOL_CAPTURE + DEGREE_LINK + "学士学位")
+RELEVANT_LINE_RE = re.compile(
+    r"大学|学院|研究所|研究院|博士|硕士|学士|教授|研究员|讲师|加入|入职|简历|19\d{2}|20\d{2}"
+    r"|Ph\.?D|B\.?S\.|M\.?S\.|University|Institute|Professor|profile|homepage",
+    re.IGNORECASE,
+)
+PROFILE_PROMPT_MAX_CHARS = 4000
+PROFILE_SYSTEM_PROMPT = (
+    "你会收到某位教师个人主页的正文文本，请仅基于这些文本抽取字段。"
+    "不能使用外部搜索，不能猜测。"
+    "\n只输出纯文本JSON对象，字段完整："
+    "name_en,title,profile_url,bs_school,ms_school,phd_school,join_pku_year,notes。"
+    "\n字段为空时用空字符串。"
+    "\nbs_school/ms_school/phd_school 仅输出学校或科研机构名称，"
+    "不要包含院系、专业、实验室或项目描述（例如不要输出‘物理系’）。"
+)
+
+RowKey = Tuple[str, ...]
+SearchBatch = Tuple[List[Dict[str, object]], bool]
+
+SEARCH_CONTEXT_FIELDS = [
+    "name_en",
+    "title",
+    "profile_url",
+    "bs_school",
+    "ms_school",
+    "phd_school",
+    "join_pku_year",
+]
+
+WEB_SEARCH_BATCH_SIZE = 8
+PROFILE_MAX_BYTES = 512 * 1024
+PER_HOST_CONCURRENCY = 2
+PROFILE_MEMO_SIZE = 64
 
 
 def _same_domain_or_subdomain(base_url: str, target_url: str) -> bool:
@@ -39,23 +117,9 @@ def _same_domain_or_subdomain(base_url: str, target_url: str) -> bool:
     return target_host == base_host or target_host.endswith("." + base_host)
 
 
-def _looks_like_profile_hint(text: str) -> bool:
-    lowered = str(text or "").strip().lower()
-    if not lowered:
-        return False
-    return any(hint in lowered for hint in PROFILE_LINK_HINTS)
-
-
-def _score_profile_link(text: str, href: str) -> int:
-    lowered = (str(text or "") + " " + str(href or "")).lower()
-    score = 0
-    if "个人主页" in lowered or "homepage" in lowered:
-        score += 5
-    if "简历" in lowered or "cv" in lowered or "resume" in lowered:
-        score += 4
-    if "详细" in lowered or "详情" in lowered or "profile" in lowered:
-        score += 2
-    return score
+def _score_profile_link(lowered: str) -> int:
+    groups = {match.lastgroup for match in PROFILE_SCORE_RE.finditer(lowered)}
+    return sum(PROFILE_SCORE_WEIGHTS[group] for group in groups if group)
 
 
 def _completion_status(row: Dict[str, object]) -> str:
@@ -67,6 +131,13 @@ def _completion_status(row: Dict[str, object]) -> str:
     return "incomplete"
 
 
+def _stored_status(row: Dict[str, object]) -> str:
+    status = row.get("status")
+    if status in ("complete", "incomplete", SEARCH_PENDING_STATUS):
+        return str(status)
+    return _completion_status(row)
+
+
 def _default_enriched(row: Dict[str, object]) -> Dict[str, object]:
     return {
         "department_name_zh": row.get("department_name_zh", ""),
@@ -82,64 +153,201 @@ def _default_enriched(row: Dict[str, object]) -> Dict[str, object]:
         "status": "incomplete",
         "notes": "",
         "crawl_date": today_str(),
+        "seed_key": list(_row_key(row)),
     }
 
 
 def _normalize_year(value: str) -> str:
     text = str(value or "").strip()
-    match = re.search(r"\b(19\d{2}|20\d{2})\b", text)
+    match = YEAR_RE.search(text)
     return match.group(1) if match else ""
 
 
-def _fetch_profile_text(profile_url: str, timeout: int = 20) -> str:
-    url = str(profile_url or "").strip()
-    if not url:
-        return ""
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-        )
-    }
+@lru_cache(maxsize=1)
+def _http_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+            ),
+        }
+    )
+    return session
+
+
+_HOST_SEMAPHORES: Dict[str, threading.Semaphore] = {}
+_HOST_SEMAPHORES_LOCK = threading.Lock()
+
+
+def _host_semaphore(url: str) -> threading.Semaphore:
+    host = (urlparse(url).hostname or "").lower()
+    with _HOST_SEMAPHORES_LOCK:
+        semaphore = _HOST_SEMAPHORES.get(host)
+        if semaphore is None:
+            semaphore = threading.Semaphore(PER_HOST_CONCURRENCY)
+            _HOST_SEMAPHORES[host] = semaphore
+        return semaphore
+
+
+def _get_with_retry(
+    url: str,
+    timeout: int,
+    attempts: int = 4,
+    base: float = 0.5,
+    cap: float = 30.0,
+    budget: float = 90.0,
+) -> requests.Response:
+    deadline = time.monotonic() + budget
+    attempt = 0
+    last_error: Optional[Exception] = None
+    while True:
+        try:
+            response = _http_session().get(url, timeout=timeout, stream=True)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            last_error = exc
+            response = None
+        if response is not None and response.status_code < 500:
+            return response
+        attempt += 1
+        delay = min(cap, base * 2 ** (attempt - 1)) + random.uniform(0, 0.25)
+        if attempt >= attempts or time.monotonic() + delay >= deadline:
+            if response is None and last_error is not None:
+                raise last_error
+            return response
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+
+
+_PROFILE_CACHE_REFRESH = False
+
+
+def set_profile_cache_refresh(refresh: bool) -> None:
+    global _PROFILE_CACHE_REFRESH
+    _PROFILE_CACHE_REFRESH = refresh
+
+
+def _profile_cache_path(url: str) -> Path:
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return PROFILE_HTML_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def _read_profile_cache(url: str) -> Optional[Tuple[str, str]]:
+    if _PROFILE_CACHE_REFRESH:
+        return None
+    path = _profile_cache_path(url)
     try:
-        response = requests.get(url, timeout=timeout, headers=headers)
-        response.raise_for_status()
-        response.encoding = response.apparent_encoding or response.encoding
-    except Exception:
-        return ""
+        if DEFAULT_PROFILE_CACHE_TTL_DAYS > 0:
+            age = time.time() - os.path.getmtime(path)
+            if age > DEFAULT_PROFILE_CACHE_TTL_DAYS * 86400:
+                return None
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return str(entry.get("html", "")), str(entry.get("url", "") or url)
+
+
+def _write_profile_cache(url: str, html: str, resolved_url: str) -> None:
+    path = _profile_cache_path(url)
+    ensure_dir(path.parent)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(
+        json.dumps({"url": resolved_url, "html": html}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    for tag in soup(["script", "style", "noscript", "svg", "footer", "nav"]):
-        tag.extract()
-    text = soup.get_text("\n", strip=True)
-    text = re.sub(r"\n{2,}", "\n", text)
-    return text[:12000]
+
+class _UrlFetch:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.users = 0
+        self.done = False
+        self.entry: Optional[Tuple[str, str]] = None
+
+
+_PROFILE_MEMO: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+_PROFILE_FETCHES: Dict[str, _UrlFetch] = {}
+_PROFILE_MEMO_LOCK = threading.Lock()
 
 
-def _fetch_profile_page(profile_url: str, timeout: int = 20) -> Tuple[str, BeautifulSoup, str]:
+def _memoized_profile(url: str) -> Optional[Tuple[str, str]]:
+    with _PROFILE_MEMO_LOCK:
+        entry = _PROFILE_MEMO.get(url)
+        if entry is not None:
+            _PROFILE_MEMO.move_to_end(url)
+        return entry
+
+
+def _download_profile_html(url: str, timeout: int, refresh: bool = False) -> Optional[Tuple[str, str]]:
+    entry = None if refresh else _memoized_profile(url)
+    if entry is not None:
+        return entry
+    with _PROFILE_MEMO_LOCK:
+        fetch = _PROFILE_FETCHES.get(url)
+        if fetch is None:
+            fetch = _PROFILE_FETCHES[url] = _UrlFetch()
+        fetch.users += 1
+    try:
+        with fetch.lock:
+            if fetch.done:
+                return fetch.entry
+            cached = None if refresh else _read_profile_cache(url)
+            entry = cached or _request_profile_html(url, timeout)
+            fetch.entry, fetch.done = entry, True
+            if entry is not None:
+                with _PROFILE_MEMO_LOCK:
+                    _PROFILE_MEMO[url] = entry
+                    if len(_PROFILE_MEMO) > PROFILE_MEMO_SIZE:
+                        _PROFILE_MEMO.popitem(last=False)
+            return entry
+    finally:
+        with _PROFILE_MEMO_LOCK:
+            fetch.users -= 1
+            if fetch.users == 0:
+                del _PROFILE_FETCHES[url]
+
+
+def _request_profile_html(url: str, timeout: int) -> Optional[Tuple[str, str]]:
+    try:
+        with _host_semaphore(url), _get_with_retry(url, timeout) as response:
+            response.raise_for_status()
+            body = response.raw.read(PROFILE_MAX_BYTES, decode_content=True)
+            encoding = chardet.detect(body).get("encoding") or response.encoding or "utf-8"
+            resolved_url = str(response.url or url)
+        html = body.decode(encoding, errors="replace")
+    except Exception:
+        return None
+    try:
+        _write_profile_cache(url, html, resolved_url)
+    except OSError:
+        pass
+    return html, resolved_url
+
+
+def _fetch_profile_page(
+    profile_url: str, timeout: int = 20, refresh: bool = False
+) -> Tuple[str, BeautifulSoup, str]:
     url = str(profile_url or "").strip()
-    empty_soup = BeautifulSoup("", "html.parser")
+    empty_soup = BeautifulSoup("", HTML_PARSER)
     if not url:
         return "", empty_soup, ""
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-        )
-    }
-    try:
-        response = requests.get(url, timeout=timeout, headers=headers)
-        response.raise_for_status()
-        response.encoding = response.apparent_encoding or response.encoding
-    except Exception:
+    downloaded = _download_profile_html(url, timeout, refresh)
+    if downloaded is None:
         return "", empty_soup, url
+    html, resolved_url = downloaded
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = BeautifulSoup(html, HTML_PARSER)
     for tag in soup(["script", "style", "noscript", "svg", "footer", "nav"]):
         tag.extract()
     text = soup.get_text("\n", strip=True)
-    text = re.sub(r"\n{2,}", "\n", text)
-    return text[:12000], soup, str(response.url or url)
+    text = MULTI_NEWLINE_RE.sub("\n", text)
+    return text[:12000], soup, resolved_url
 
 
 def _discover_secondary_profile_links(soup: BeautifulSoup, base_url: str, max_links: int = 2) -> List[str]:
@@ -149,15 +357,15 @@ def _discover_secondary_profile_links(soup: BeautifulSoup, base_url: str, max_li
         href = str(anchor.get("href") or "").strip()
         if not href:
             continue
+        lowered = f"{link_text} {href}".lower()
+        if PROFILE_HINT_RE.search(lowered) is None:
+            continue
         absolute = urljoin(base_url, href)
         if not absolute.startswith("http"):
             continue
         if not _same_domain_or_subdomain(base_url, absolute):
             continue
-        if not _looks_like_profile_hint(link_text) and not _looks_like_profile_hint(href):
-            continue
-        score = _score_profile_link(link_text, href)
-        scored.append((score, absolute))
+        scored.append((_score_profile_link(lowered), absolute))
 
     scored.sort(key=lambda item: item[0], reverse=True)
     selected: List[str] = []
@@ -172,8 +380,8 @@ def _discover_secondary_profile_links(soup: BeautifulSoup, base_url: str, max_li
     return selected
 
 
-def _fetch_profile_text_with_secondary_links(profile_url: str) -> str:
-    primary_text, soup, resolved_url = _fetch_profile_page(profile_url)
+def _fetch_profile_text_with_secondary_links(profile_url: str, refresh: bool = False) -> str:
+    primary_text, soup, resolved_url = _fetch_profile_page(profile_url, refresh=refresh)
     combined_parts: List[str] = []
     if primary_text:
         combined_parts.append(primary_text)
@@ -182,7 +390,7 @@ def _fetch_profile_text_with_secondary_links(profile_url: str) -> str:
 
     secondary_links = _discover_secondary_profile_links(soup, resolved_url, max_links=2)
     for link in secondary_links:
-        secondary_text, _, _ = _fetch_profile_page(link)
+        secondary_text, _, _ = _fetch_profile_page(link, refresh=refresh)
         if secondary_text:
             combined_parts.append(secondary_text)
 
@@ -218,142 +426,280 @@ def _needs_search_fallback(result: Dict[str, object]) -> bool:
     )
 
 
-def _enrich_one(
-    row: Dict[str, object],
-    client: DeepSeekClient,
-    enable_web_search_fallback: bool = True,
+def _append_note(result: Dict[str, object], suffix: str) -> None:
+    existing_notes = str(result.get("notes", "")).strip()
+    result["notes"] = f"{existing_notes}; {suffix}" if existing_notes else suffix
+
+
+def _unique_match(pattern: re.Pattern, text: str) -> str:
+    values = {match.group(1).strip() for match in pattern.finditer(text)}
+    return values.pop() if len(values) == 1 else ""
+
+
+def _regex_extract(text: str) -> Dict[str, object]:
+    return {
+        "bs_school": _unique_match(BS_SCHOOL_RE, text),
+        "phd_school": _unique_match(PHD_SCHOOL_RE, text),
+        "join_pku_year": _unique_match(JOIN_YEAR_RE, text),
+    }
+
+
+def _relevant_profile_text(text: str, limit: int = PROFILE_PROMPT_MAX_CHARS) -> str:
+    lines = text.split("\n")
+    keep = {0, 1}
+    for index, line in enumerate(lines):
+        if RELEVANT_LINE_RE.search(line):
+            keep.update((index - 1, index, index + 1))
+    selected = "\n".join(line for index, line in enumerate(lines) if index in keep)
+    return selected[:limit]
+
+
+def _enrich_from_profile(
+    row: Dict[str, object], client: DeepSeekClient, refresh: bool = False
 ) -> Dict[str, object]:
     result = _default_enriched(row)
     if not client.enabled:
         return result
 
     identity = result["name_zh"] or result["name_en"]
-    profile_text = _fetch_profile_text_with_secondary_links(str(result.get("profile_url", "")))
+    profile_text = _fetch_profile_text_with_secondary_links(str(result.get("profile_url", "")), refresh)
     if profile_text:
+        regex_payload = _regex_extract(profile_text)
         profile_prompt = (
-            "你会收到某位教师个人主页的正文文本，请仅基于这些文本抽取字段。"
-            "不能使用外部搜索，不能猜测。"
-            "\n只输出纯文本JSON对象，字段完整："
-            "name_en,title,profile_url,bs_school,ms_school,phd_school,join_pku_year,notes。"
-            "\n字段为空时用空字符串。"
-            "\nbs_school/ms_school/phd_school 仅输出学校或科研机构名称，"
-            "不要包含院系、专业、实验室或项目描述（例如不要输出‘物理系’）。"
-            f"\n姓名: {identity}"
+            f"姓名: {identity}"
             f"\n学部: {result['department_name_zh']}"
             f"\n学院: {result['school_name_zh']}"
             f"\n主页URL: {result.get('profile_url', '')}"
-            f"\n主页正文:\n{profile_text}"
+            f"\n主页正文:\n{_relevant_profile_text(profile_text)}"
         )
         try:
-            profile_text_resp = client.chat_json(profile_prompt, temperature=0.0)
+            profile_text_resp = client.chat_json(
+                profile_prompt, temperature=0.0, system=PROFILE_SYSTEM_PROMPT, refresh=refresh
+            )
             profile_payload = parse_json_obj(profile_text_resp)
             _apply_payload(result, profile_payload, fill_only_missing=False)
         except Exception as exc:
             result["notes"] = f"profile_extract_error: {exc}"
-
-    if enable_web_search_fallback and _needs_search_fallback(result):
-        prompt = (
-            "网络搜索北京大学相关学院教师主页或个人简历，检索这位北京大学教师信息。"
-            "优先补全缺失字段，不要覆盖已有且看似合理的信息。"
-            f"\n姓名: {identity}"
-            f"\n学部: {result['department_name_zh']}"
-            f"\n学院: {result['school_name_zh']}"
-            "\n只输出纯文本JSON对象，字段完整："
-            "name_en,title,profile_url,bs_school,ms_school,phd_school,join_pku_year,notes。"
-            "\n如果不确定请留空字符串，不要有任何编造！"
-            "\nbs_school/ms_school/phd_school仅写学校或机构名称，"
-            "不要包含院系、专业、实验室或项目描述（例如不要输出‘物理系’）。"
-            "\njoin_pku_year只保留4位年份。"
-            "\n当前已提取信息："
-            f"\nname_en={result.get('name_en','')}"
-            f"\ntitle={result.get('title','')}"
-            f"\nprofile_url={result.get('profile_url','')}"
-            f"\nbs_school={result.get('bs_school','')}"
-            f"\nms_school={result.get('ms_school','')}"
-            f"\nphd_school={result.get('phd_school','')}"
-            f"\njoin_pku_year={result.get('join_pku_year','')}"
-        )
-        try:
-            text = client.chat_json(prompt, temperature=0.05)
-            payload = parse_json_obj(text)
-            _apply_payload(result, payload, fill_only_missing=True)
-        except Exception as exc:
-            existing_notes = str(result.get("notes", "")).strip()
-            suffix = f"deepseek_error: {exc}"
-            result["notes"] = f"{existing_notes}; {suffix}" if existing_notes else suffix
-    elif (not enable_web_search_fallback) and _needs_search_fallback(result):
-        existing_notes = str(result.get("notes", "")).strip()
-        suffix = "web_search_disabled"
-        result["notes"] = f"{existing_notes}; {suffix}" if existing_notes else suffix
-
-    result["status"] = _completion_status(result)
+        _apply_payload(result, regex_payload, fill_only_missing=True)
     return result
 
 
-def _row_key(row: Dict[str, object]) -> str:
-    return "|".join(
-        [
-            str(row.get("department_name_zh", "")),
-            str(row.get("school_name_zh", "")),
-            str(row.get("name_zh", "")),
-            str(row.get("name_en", "")),
-        ]
+def _apply_web_search_fallback(result: Dict[str, object], client: DeepSeekClient, refresh: bool = False) -> None:
+    identity = result["name_zh"] or result["name_en"]
+    prompt = (
+        "网络搜索北京大学相关学院教师主页或个人简历，检索这位北京大学教师信息。"
+        "优先补全缺失字段，不要覆盖已有且看似合理的信息。"
+        f"\n姓名: {identity}"
+        f"\n学部: {result['department_name_zh']}"
+        f"\n学院: {result['school_name_zh']}"
+        "\n只输出纯文本JSON对象，字段完整："
+        "name_en,title,profile_url,bs_school,ms_school,phd_school,join_pku_year,notes。"
+        "\n如果不确定请留空字符串，不要有任何编造！"
+        "\nbs_school/ms_school/phd_school仅写学校或机构名称，"
+        "不要包含院系、专业、实验室或项目描述（例如不要输出‘物理系’）。"
+        "\njoin_pku_year只保留4位年份。"
+        "\n当前已提取信息："
+        f"\nname_en={result.get('name_en','')}"
+        f"\ntitle={result.get('title','')}"
+        f"\nprofile_url={result.get('profile_url','')}"
+        f"\nbs_school={result.get('bs_school','')}"
+        f"\nms_school={result.get('ms_school','')}"
+        f"\nphd_school={result.get('phd_school','')}"
+        f"\njoin_pku_year={result.get('join_pku_year','')}"
     )
+    try:
+        text = client.chat_json(prompt, temperature=0.05, refresh=refresh)
+        payload = parse_json_obj(text)
+        _apply_payload(result, payload, fill_only_missing=True)
+    except Exception as exc:
+        _append_note(result, f"deepseek_error: {exc}")
 
 
-def _enrich_task(row: Dict[str, object], enable_web_search_fallback: bool) -> Dict[str, object]:
-    client = DeepSeekClient()
-    return _enrich_one(row, client, enable_web_search_fallback=enable_web_search_fallback)
+def _apply_web_search_batch(
+    results: List[Dict[str, object]], client: DeepSeekClient, refresh: bool = False
+) -> None:
+    if len(results) == 1:
+        _apply_web_search_fallback(results[0], client, refresh)
+        return
+
+    people = [
+        {
+            "index": index,
+            "name": result["name_zh"] or result["name_en"],
+            "department": result["department_name_zh"],
+            "school": result["school_name_zh"],
+            **{key: result.get(key, "") for key in SEARCH_CONTEXT_FIELDS},
+        }
+        for index, result in enumerate(results)
+    ]
+    prompt = (
+        f"网络搜索北京大学相关学院教师主页或个人简历，分别检索以下{len(results)}位北京大学教师信息。"
+        "优先补全缺失字段，不要覆盖已有且看似合理的信息。"
+        "\n只输出纯文本JSON数组，元素与输入顺序一一对应，每个元素为JSON对象，字段完整："
+        "index,name_en,title,profile_url,bs_school,ms_school,phd_school,join_pku_year,notes。"
+        "\nindex与输入中的index相同。"
+        "\n如果不确定请留空字符串，不要有任何编造！"
+        "\nbs_school/ms_school/phd_school仅写学校或机构名称，"
+        "不要包含院系、专业、实验室或项目描述（例如不要输出‘物理系’）。"
+        "\njoin_pku_year只保留4位年份。"
+        "\n教师列表（含当前已提取信息）：\n"
+        + json.dumps(people, ensure_ascii=False)
+    )
+    try:
+        text = client.chat_json(prompt, temperature=0.05, refresh=refresh)
+        payloads = parse_json_obj_list(text)
+    except Exception as exc:
+        for result in results:
+            _append_note(result, f"deepseek_error: {exc}")
+        return
+
+    answered: Set[int] = set()
+    for position, payload in enumerate(payloads):
+        try:
+            index = int(payload.get("index", position))
+        except (TypeError, ValueError):
+            index = position
+        if index in answered or not 0 <= index < len(results):
+            continue
+        answered.add(index)
+        _apply_payload(results[index], payload, fill_only_missing=True)
+
+    for index, result in enumerate(results):
+        if index not in answered:
+            _apply_web_search_fallback(result, client, refresh)
+
+
+def _row_key(row: Dict[str, object]) -> RowKey:
+    return tuple(str(row.get(field, "")) for field in ENRICHED_KEY_FIELDS)
+
+
+def _enrich_task(item: Tuple[Dict[str, object], bool], client: DeepSeekClient) -> Dict[str, object]:
+    row, refresh = item
+    return _enrich_from_profile(row, client, refresh)
+
+
+def _search_task(batch: SearchBatch, client: DeepSeekClient) -> None:
+    results, refresh = batch
+    _apply_web_search_batch(results, client, refresh)
+
+
+def _is_pending(key: RowKey, existing_status: Dict[RowKey, str], retry_incomplete: bool) -> bool:
+    status = existing_status.get(key)
+    if status is None or status == SEARCH_PENDING_STATUS:
+        return True
+    return retry_incomplete and status != "complete"
+
+
+def _checkpoint_rows(rows: List[Dict[str, object]]) -> int:
+    for row in rows:
+        row["status"] = _completion_status(row)
+    append_jsonl(ENRICHED_JSONL, rows)
+    return len(rows)
+
+
+def _compact_enriched() -> Tuple[int, int]:
+    merged_map: Dict[RowKey, Dict[str, object]] = {}
+    for row in iter_jsonl(ENRICHED_JSONL):
+        row["status"] = _stored_status(row)
+        merged_map[enriched_row_key(row)] = row
+    tmp_path = ENRICHED_JSONL.with_name(ENRICHED_JSONL.name + ".tmp")
+    write_jsonl(tmp_path, merged_map.values())
+    os.replace(tmp_path, ENRICHED_JSONL)
+    search_pending = sum(1 for row in merged_map.values() if row["status"] == SEARCH_PENDING_STATUS)
+    return len(merged_map), search_pending
 
 
 def run(
     limit: Optional[int] = None,
     resume: bool = True,
-    workers: int = 3,
+    workers: int = 16,
     enable_web_search_fallback: bool = True,
+    search_batch_size: int = WEB_SEARCH_BATCH_SIZE,
+    retry_incomplete: bool = False,
 ) -> None:
-    names = read_jsonl(PROFESSOR_NAMES_JSONL)
-
-    existing_rows = read_jsonl(ENRICHED_JSONL) if resume else []
-    existing_keys = {_row_key(row) for row in existing_rows}
+    existing_status: Dict[RowKey, str] = {}
+    if resume:
+        stored_rows = 0
+        for row in iter_jsonl(ENRICHED_JSONL):
+            existing_status[enriched_row_key(row)] = _stored_status(row)
+            stored_rows += 1
+        if stored_rows > len(existing_status):
+            _compact_enriched()
+    else:
+        write_jsonl(ENRICHED_JSONL, [])
 
-    pending = [row for row in names if _row_key(row) not in existing_keys]
+    pending: Iterable[Tuple[Dict[str, object], bool]] = (
+        (row, existing_status.get(key) == "incomplete")
+        for row, key in ((row, _row_key(row)) for row in iter_jsonl(PROFESSOR_NAMES_JSONL))
+        if _is_pending(key, existing_status, retry_incomplete)
+    )
     if limit is not None and limit > 0:
-        pending = pending[:limit]
+        pending = itertools.islice(pending, limit)
 
     workers = max(1, workers)
-    new_rows: List[Dict[str, object]] = []
-    if workers == 1:
-        client = DeepSeekClient()
-        for row in pending:
-            new_rows.append(
-                _enrich_one(row, client, enable_web_search_fallback=enable_web_search_fallback)
-            )
-    else:
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            future_map = {
-                executor.submit(_enrich_task, row, enable_web_search_fallback): row
-                for row in pending
-            }
-            for future in as_completed(future_map):
-                seed_row = future_map[future]
+    batch_size = max(1, search_batch_size)
+    max_in_flight = 2 * workers
+    client = DeepSeekClient()
+    new_count = 0
+    open_batches: Dict[Tuple[str, bool], List[Dict[str, object]]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight: Dict["Future[Any]", Tuple[Callable[..., Any], Any]] = {}
+
+        def submit(fn: Callable[..., Any], item: Any) -> None:
+            in_flight[executor.submit(fn, item, client)] = (fn, item)
+
+        exhausted = False
+        while True:
+            room = max(0, max_in_flight - len(in_flight))
+            if not exhausted and room:
+                items = list(itertools.islice(pending, room))
+                exhausted = len(items) < room
+                for item in items:
+                    submit(_enrich_task, item)
+            if not in_flight:
+                if not open_batches:
+                    break
+                for (_, refresh), results in open_batches.items():
+                    submit(_search_task, (results, refresh))
+                open_batches.clear()
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                fn, item = in_flight.pop(future)
+                if fn is _search_task:
+                    batch = item[0]
+                    try:
+                        future.result()
+                    except Exception as exc:
+                        for row in batch:
+                            _append_note(row, f"concurrent_enrich_error: {exc}")
+                    new_count += _checkpoint_rows(batch)
+                    continue
+
+                seed_row, refresh = item
                 try:
-                    new_rows.append(future.result())
+                    result = future.result()
                 except Exception as exc:
-                    fallback = _default_enriched(seed_row)
-                    fallback["notes"] = f"concurrent_enrich_error: {exc}"
-                    fallback["status"] = _completion_status(fallback)
-                    new_rows.append(fallback)
-
-    merged_map = {_row_key(row): row for row in existing_rows}
-    for row in new_rows:
-        merged_map[_row_key(row)] = row
-    enriched_rows = list(merged_map.values())
-    for row in enriched_rows:
-        row["status"] = _completion_status(row)
-
-    write_jsonl(ENRICHED_JSONL, enriched_rows)
-    print(f"Phase2 finished: new={len(new_rows)}, total={len(enriched_rows)}")
+                    result = _default_enriched(seed_row)
+                    result["notes"] = f"concurrent_enrich_error: {exc}"
+                else:
+                    if client.enabled and _needs_search_fallback(result):
+                        if enable_web_search_fallback:
+                            batch_key = (str(result.get("school_name_zh", "")), refresh)
+                            append_jsonl(ENRICHED_JSONL, [{**result, "status": SEARCH_PENDING_STATUS}])
+                            batch = open_batches.setdefault(batch_key, [])
+                            batch.append(result)
+                            if len(batch) >= batch_size:
+                                submit(_search_task, (open_batches.pop(batch_key), refresh))
+                            continue
+                        _append_note(result, "web_search_disabled")
+                new_count += _checkpoint_rows([result])
+
+    total, search_pending = _compact_enriched()
+    if search_pending:
+        print(f"Phase2 warning: {search_pending} rows still marked {SEARCH_PENDING_STATUS} after the run")
+    print(f"Phase2 finished: new={new_count}, total={total}")
 
 
 if __name__ == "__main__":
@@ -1,16 +1,30 @@
 from __future__ import annotations
 
+import itertools
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
 
 from .config import (
     ENRICHED_JSONL,
+    NORMALIZATION_CACHE_JSONL,
     NORMALIZATION_REVIEW_JSONL,
     NORMALIZED_JSONL,
     UNIVERSITY_ALIAS_DICTIONARY_CSV,
 )
 from .deepseek_client import DeepSeekClient
-from .utils import parse_json_obj, read_csv_rows, read_jsonl, today_str, write_jsonl
+from .utils import (
+    append_jsonl,
+    iter_enriched_rows,
+    iter_jsonl,
+    parse_json_obj,
+    parse_json_obj_list,
+    read_csv_rows,
+    today_str,
+    write_jsonl,
+)
 
 ALIAS_TO_STD: Dict[str, str] = {
     "北大": "PKU",
@@ -31,6 +45,12 @@ ALIAS_TO_STD: Dict[str, str] = {
     "吉林大学": "JLU",
 }
 
+NORMALIZE_FIELDS = ["bs_school", "ms_school", "phd_school"]
+DEEPSEEK_BATCH_SIZE = 32
+DEEPSEEK_BATCH_WORKERS = 4
+
+MappingResult = Tuple[str, float, str]
+
 
 @lru_cache(maxsize=1)
 def _load_alias_map() -> Dict[str, str]:
@@ -46,20 +66,35 @@ def _load_alias_map() -> Dict[str, str]:
     return alias_map
 
 
-def _map_deterministic(name: str, alias_map: Dict[str, str]) -> Optional[str]:
+AliasMatcher = Tuple[Optional[Pattern[str]], Dict[str, int]]
+
+
+@lru_cache(maxsize=1)
+def _load_alias_matcher() -> AliasMatcher:
+    aliases = sorted((alias for alias in _load_alias_map() if alias), key=len, reverse=True)
+    if not aliases:
+        return None, {}
+    pattern = re.compile("(?=(" + "|".join(re.escape(alias) for alias in aliases) + "))")
+    return pattern, {alias: rank for rank, alias in enumerate(aliases)}
+
+
+def _map_deterministic(name: str, alias_map: Dict[str, str], alias_matcher: AliasMatcher) -> Optional[str]:
     text = (name or "").strip()
     if not text:
         return ""
     if text in alias_map:
         return alias_map[text]
 
-    for alias, standard in alias_map.items():
-        if alias and alias in text:
-            return standard
-    return None
+    pattern, ranks = alias_matcher
+    if pattern is None:
+        return None
+    found = [match.group(1) for match in pattern.finditer(text)]
+    if not found:
+        return None
+    return alias_map[min(found, key=ranks.__getitem__)]
 
 
-def _map_with_deepseek(name: str, client: DeepSeekClient) -> Tuple[str, float, str]:
+def _map_with_deepseek(name: str, client: DeepSeekClient) -> MappingResult:
     if not name.strip():
         return "", 1.0, "empty"
     if not client.enabled:
@@ -73,26 +108,130 @@ def _map_with_deepseek(name: str, client: DeepSeekClient) -> Tuple[str, float, s
     )
     try:
         text = client.chat_json(prompt, temperature=0.0)
-        payload = parse_json_obj(text)
-        abbr = str(payload.get("abbr", "")).strip().upper()
-        confidence_raw = payload.get("confidence", 0)
-        try:
-            confidence = float(confidence_raw)
-        except Exception:
-            confidence = 0.0
-        reason = str(payload.get("reason", "")).strip()
-        return abbr, confidence, reason
+        return _mapping_from_payload(parse_json_obj(text))
     except Exception as exc:
         return "", 0.0, f"deepseek_error: {exc}"
 
 
+def _map_batch_with_deepseek(names: List[str], client: DeepSeekClient) -> Dict[str, MappingResult]:
+    if len(names) == 1:
+        return {names[0]: _map_with_deepseek(names[0], client)}
+
+    prompt = (
+        "你负责把学校/科研机构名称标准化成简写（如 PKU, CAS, THU）。"
+        "返回JSON数组，元素与输入顺序一一对应："
+        "[{\"name\":\"\",\"abbr\":\"\",\"confidence\":0~1,\"reason\":\"\"}]，name原样照抄输入名称。"
+        "若不确定，abbr返回空字符串。"
+        f"\n待标准化名称列表: {json.dumps(names, ensure_ascii=False)}"
+    )
+    try:
+        text = client.chat_json(prompt, temperature=0.0)
+        payloads = parse_json_obj_list(text)
+    except Exception as exc:
+        return {name: ("", 0.0, f"deepseek_error: {exc}") for name in names}
+
+    wanted = set(names)
+    results: Dict[str, MappingResult] = {}
+    for payload in payloads:
+        name = str(payload.get("name", "")).strip()
+        if name in wanted and name not in results:
+            results[name] = _mapping_from_payload(payload)
+    for name in names:
+        if name not in results:
+            results[name] = _map_with_deepseek(name, client)
+    return results
+
+
+def _mapping_from_payload(payload: Dict[str, object]) -> MappingResult:
+    abbr = str(payload.get("abbr", "")).strip().upper()
+    confidence_raw = payload.get("confidence", 0)
+    try:
+        confidence = float(confidence_raw)
+    except Exception:
+        confidence = 0.0
+    reason = str(payload.get("reason", "")).strip()
+    return abbr, confidence, reason
+
+
+_NORMALIZATION_CACHE_REFRESH = False
+
+
+def set_normalization_cache_refresh(refresh: bool) -> None:
+    global _NORMALIZATION_CACHE_REFRESH
+    _NORMALIZATION_CACHE_REFRESH = refresh
+
+
+def _load_normalization_cache() -> Dict[str, MappingResult]:
+    cache: Dict[str, MappingResult] = {}
+    if _NORMALIZATION_CACHE_REFRESH:
+        return cache
+    for row in iter_jsonl(NORMALIZATION_CACHE_JSONL):
+        name = str(row.get("name", "")).strip()
+        if name:
+            cache[name] = _mapping_from_payload(row)
+    return cache
+
+
+def _store_normalization_cache(results: Dict[str, MappingResult]) -> None:
+    rows = [
+        {"name": name, "abbr": abbr, "confidence": confidence, "reason": reason}
+        for name, (abbr, confidence, reason) in results.items()
+        if not reason.startswith("deepseek_error")
+    ]
+    if rows:
+        append_jsonl(NORMALIZATION_CACHE_JSONL, rows)
+
+
+def _prefetch_model_results(
+    rows: List[Dict[str, object]],
+    alias_map: Dict[str, str],
+    alias_matcher: AliasMatcher,
+    client: DeepSeekClient,
+    manual_overrides: Dict[Tuple[str, str], str],
+    known: Dict[str, MappingResult],
+) -> Dict[str, MappingResult]:
+    if not client.enabled:
+        return {}
+
+    seen: Set[str] = set(known)
+    unresolved: List[str] = []
+    for row in rows:
+        for field in NORMALIZE_FIELDS:
+            value = str(row.get(field, "") or "").strip()
+            if not value or value in seen or (field, value) in manual_overrides:
+                continue
+            seen.add(value)
+            if _map_deterministic(value, alias_map, alias_matcher) is None:
+                unresolved.append(value)
+
+    batches = [
+        unresolved[start : start + DEEPSEEK_BATCH_SIZE]
+        for start in range(0, len(unresolved), DEEPSEEK_BATCH_SIZE)
+    ]
+    results: Dict[str, MappingResult] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(DEEPSEEK_BATCH_WORKERS, len(batches) or 1))) as executor:
+        for batch_results in executor.map(lambda batch: _map_batch_with_deepseek(batch, client), batches):
+            results.update(batch_results)
+    return results
+
+
+def _row_key(row: Dict[str, object]) -> str:
+    return "|".join(
+        [
+            str(row.get("department_name_zh", "")),
+            str(row.get("school_name_zh", "")),
+            str(row.get("name_zh", "")),
+            str(row.get("name_en", "")),
+        ]
+    )
+
+
 def _load_manual_overrides() -> Dict[Tuple[str, str], str]:
     overrides: Dict[Tuple[str, str], str] = {}
     if not NORMALIZATION_REVIEW_JSONL.exists():
         return overrides
 
-    rows = read_jsonl(NORMALIZATION_REVIEW_JSONL)
-    for row in rows:
+    for row in iter_jsonl(NORMALIZATION_REVIEW_JSONL):
         field = str(row.get("field", "")).strip()
         original_value = str(row.get("original_value", "")).strip()
         if not field or not original_value:
@@ -114,7 +253,9 @@ def _load_manual_overrides() -> Dict[Tuple[str, str], str]:
 def _normalize_field(
     source_value: str,
     alias_map: Dict[str, str],
+    alias_matcher: AliasMatcher,
     client: DeepSeekClient,
+    model_results: Dict[str, MappingResult],
     review_rows: List[Dict[str, object]],
     row_key: str,
     field_name: str,
@@ -133,12 +274,15 @@ def _normalize_field(
     if source_value in value_cache:
         return value_cache[source_value]
 
-    mapped = _map_deterministic(source_value, alias_map)
+    mapped = _map_deterministic(source_value, alias_map, alias_matcher)
     if mapped is not None:
         value_cache[source_value] = mapped
         return mapped
 
-    abbr, confidence, reason = _map_with_deepseek(source_value, client)
+    result = model_results.get(source_value)
+    if result is None:
+        result = _map_with_deepseek(source_value, client) if client.enabled else ("", 0.0, "client_disabled")
+    abbr, confidence, reason = result
     if abbr and confidence >= 0.8:
         value_cache[source_value] = abbr
         return abbr
@@ -159,78 +303,69 @@ def _normalize_field(
 
 
 def run(limit: Optional[int] = None, resume: bool = True) -> None:
-    rows = read_jsonl(ENRICHED_JSONL)
+    rows: Iterable[Dict[str, object]] = iter_enriched_rows(ENRICHED_JSONL)
     if limit is not None and limit > 0:
-        rows = rows[:limit]
-
-    existing_normalized_rows = read_jsonl(NORMALIZED_JSONL) if resume else []
-    existing_review_rows = read_jsonl(NORMALIZATION_REVIEW_JSONL) if resume else []
-
-    def row_key(row: Dict[str, object]) -> str:
-        return "|".join(
-            [
-                str(row.get("department_name_zh", "")),
-                str(row.get("school_name_zh", "")),
-                str(row.get("name_zh", "")),
-                str(row.get("name_en", "")),
-            ]
-        )
+        rows = itertools.islice(rows, limit)
+
+    existing_keys = {_row_key(row) for row in iter_jsonl(NORMALIZED_JSONL)} if resume else set()
 
-    existing_keys = {row_key(row) for row in existing_normalized_rows}
-    pending_rows = [row for row in rows if row_key(row) not in existing_keys] if resume else rows
+    pending = [
+        (key, row) for key, row in ((_row_key(row), row) for row in rows) if key not in existing_keys
+    ]
+    pending_rows = [row for _, row in pending]
 
     client = DeepSeekClient()
     alias_map = _load_alias_map()
+    alias_matcher = _load_alias_matcher()
     manual_overrides = _load_manual_overrides()
+    model_results = _load_normalization_cache()
+    fetched = _prefetch_model_results(
+        pending_rows, alias_map, alias_matcher, client, manual_overrides, model_results
+    )
+    _store_normalization_cache(fetched)
+    model_results.update(fetched)
     review_rows: List[Dict[str, object]] = []
-    normalized_rows_new: List[Dict[str, object]] = []
+    new_normalized_map: Dict[str, Dict[str, object]] = {}
     value_cache: Dict[str, str] = {}
 
-    for row in pending_rows:
+    for row_identity, row in pending:
         normalized = dict(row)
-        row_identity = "|".join(
-            [
-                str(row.get("department_name_zh", "")),
-                str(row.get("school_name_zh", "")),
-                str(row.get("name_zh", "")),
-                str(row.get("name_en", "")),
-            ]
-        )
 
-        for field in ["bs_school", "ms_school", "phd_school"]:
+        for field in NORMALIZE_FIELDS:
             normalized[field] = _normalize_field(
                 str(row.get(field, "")),
                 alias_map=alias_map,
+                alias_matcher=alias_matcher,
                 client=client,
+                model_results=model_results,
                 review_rows=review_rows,
                 row_key=row_identity,
                 field_name=field,
                 value_cache=value_cache,
                 manual_overrides=manual_overrides,
             )
-        normalized_rows_new.append(normalized)
-
-    merged_normalized_map = {row_key(row): row for row in existing_normalized_rows}
-    for row in normalized_rows_new:
-        merged_normalized_map[row_key(row)] = row
-    merged_normalized_rows = list(merged_normalized_map.values())
-
-    merged_review_map = {
-        "|".join(
-            [
+        new_normalized_map[row_identity] = normalized
+
+    if resume:
+        append_jsonl(NORMALIZED_JSONL, new_normalized_map.values())
+    else:
+        write_jsonl(NORMALIZED_JSONL, new_normalized_map.values())
+    total_normalized = len(existing_keys | new_normalized_map.keys())
+
+    if review_rows or not resume:
+        existing_review_rows = iter_jsonl(NORMALIZATION_REVIEW_JSONL) if resume else iter(())
+        merged_review_map = {
+            (
                 str(row.get("row_key", "")),
                 str(row.get("field", "")),
                 str(row.get("original_value", "")),
-            ]
-        ): row
-        for row in existing_review_rows + review_rows
-    }
-
-    write_jsonl(NORMALIZATION_REVIEW_JSONL, list(merged_review_map.values()))
-    write_jsonl(NORMALIZED_JSONL, merged_normalized_rows)
+            ): row
+            for row in itertools.chain(existing_review_rows, review_rows)
+        }
+        write_jsonl(NORMALIZATION_REVIEW_JSONL, merged_review_map.values())
     print(
         "Phase3 finished: "
-        f"new_normalized={len(normalized_rows_new)}, total_normalized={len(merged_normalized_rows)}, "
+        f"new_normalized={len(new_normalized_map)}, total_normalized={total_normalized}, "
         f"new_manual_review={len(review_rows)}"
     )
 
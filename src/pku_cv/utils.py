@@ -1,11 +1,50 @@
 from __future__ import annotations
 
 import csv
+import importlib.util
 import json
 import re
 from datetime import date
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore
+
+SLUG_WS_RE = re.compile(r"\s+")
+SLUG_UNSAFE_RE = re.compile(r"[^\w\-\u4e00-\u9fff]")
+JSON_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+JSON_LIST_RE = re.compile(r"\[[\s\S]*\]")
+JSONL_WRITE_CHUNK = 1 << 20
+ENRICHED_KEY_FIELDS = ("department_name_zh", "school_name_zh", "name_zh", "name_en")
+SEARCH_PENDING_STATUS = "search_pending"
+
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+
+def _json_loads(text: Union[str, bytes]) -> object:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_line(row: Dict[str, object]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _write_json_lines(handle: BinaryIO, rows: Iterable[Dict[str, object]]) -> None:
+    buffer = bytearray()
+    for row in rows:
+        buffer += _json_line(row)
+        if len(buffer) >= JSONL_WRITE_CHUNK:
+            handle.write(buffer)
+            buffer.clear()
+    if buffer:
+        handle.write(buffer)
 
 
 def ensure_dir(path: Path) -> None:
@@ -38,36 +77,52 @@ def write_csv(path: Path, fieldnames: List[str], rows: Iterable[Dict[str, object
             writer.writerow({k: row.get(k, "") for k in fieldnames})
 
 
-def read_jsonl(path: Path) -> List[Dict[str, object]]:
+def iter_jsonl(path: Path) -> Iterator[Dict[str, object]]:
     if not path.exists():
-        return []
-    records: List[Dict[str, object]] = []
-    with path.open("r", encoding="utf-8") as handle:
+        return
+    with path.open("rb") as handle:
         for line in handle:
-            line = line.strip()
-            if not line:
+            if line.isspace():
                 continue
-            records.append(json.loads(line))
-    return records
+            yield _json_loads(line)
+
+
+def read_jsonl(path: Path) -> List[Dict[str, object]]:
+    return list(iter_jsonl(path))
 
 
 def write_jsonl(path: Path, rows: Iterable[Dict[str, object]]) -> None:
     ensure_dir(path.parent)
-    with path.open("w", encoding="utf-8") as handle:
-        for row in rows:
-            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+    with path.open("wb") as handle:
+        _write_json_lines(handle, rows)
 
 
 def append_jsonl(path: Path, rows: Iterable[Dict[str, object]]) -> None:
     ensure_dir(path.parent)
-    with path.open("a", encoding="utf-8") as handle:
-        for row in rows:
-            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+    with path.open("ab") as handle:
+        _write_json_lines(handle, rows)
+
+
+def enriched_row_key(row: Dict[str, object]) -> Tuple[str, ...]:
+    seed_key = row.get("seed_key")
+    if isinstance(seed_key, list) and len(seed_key) == len(ENRICHED_KEY_FIELDS):
+        return tuple(str(value) for value in seed_key)
+    return tuple(str(row.get(field, "")) for field in ENRICHED_KEY_FIELDS)
+
+
+def iter_enriched_rows(path: Path) -> Iterator[Dict[str, object]]:
+    last_index: Dict[Tuple[str, ...], int] = {}
+    for index, row in enumerate(iter_jsonl(path)):
+        last_index[enriched_row_key(row)] = index
+    keep = set(last_index.values())
+    for index, row in enumerate(iter_jsonl(path)):
+        if index in keep and row.get("status") != SEARCH_PENDING_STATUS:
+            yield row
 
 
 def safe_slug(value: str) -> str:
-    value = re.sub(r"\s+", "-", value.strip())
-    value = re.sub(r"[^\w\-\u4e00-\u9fff]", "", value)
+    value = SLUG_WS_RE.sub("-", value.strip())
+    value = SLUG_UNSAFE_RE.sub("", value)
     return value[:80] or "page"
 
 
@@ -80,18 +135,18 @@ def parse_json_obj(text: str) -> Dict[str, object]:
     if not text:
         return {}
     try:
-        value = json.loads(text)
+        value = _json_loads(text)
         return value if isinstance(value, dict) else {}
-    except json.JSONDecodeError:
+    except ValueError:
         pass
 
-    match = re.search(r"\{[\s\S]*\}", text)
+    match = JSON_OBJ_RE.search(text)
     if not match:
         return {}
     try:
-        value = json.loads(match.group(0))
+        value = _json_loads(match.group(0))
         return value if isinstance(value, dict) else {}
-    except json.JSONDecodeError:
+    except ValueError:
         return {}
 
 
@@ -100,20 +155,43 @@ def parse_json_list(text: str) -> List[str]:
     if not text:
         return []
     try:
-        value = json.loads(text)
+        value = _json_loads(text)
         if isinstance(value, list):
             return [str(item).strip() for item in value if str(item).strip()]
-    except json.JSONDecodeError:
+    except ValueError:
         pass
 
-    match = re.search(r"\[[\s\S]*\]", text)
+    match = JSON_LIST_RE.search(text)
     if not match:
         return []
     try:
-        value = json.loads(match.group(0))
+        value = _json_loads(match.group(0))
         if isinstance(value, list):
             return [str(item).strip() for item in value if str(item).strip()]
-    except json.JSONDecodeError:
+    except ValueError:
+        return []
+    return []
+
+
+def parse_json_obj_list(text: str) -> List[Dict[str, object]]:
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        value = _json_loads(text)
+        if isinstance(value, list):
+            return [item for item in value if isinstance(item, dict)]
+    except ValueError:
+        pass
+
+    match = JSON_LIST_RE.search(text)
+    if not match:
+        return []
+    try:
+        value = _json_loads(match.group(0))
+        if isinstance(value, list):
+            return [item for item in value if isinstance(item, dict)]
+    except ValueError:
         return []
     return []
 
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import csv
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = PROJECT_ROOT / "data" / "cache"
+
+
+def _parse_csv(path: Path, fields: Optional[Sequence[str]]) -> List[Dict[str, str]]:
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        if fields is None:
+            return [dict(row) for row in csv.DictReader(f)]
+        reader = csv.reader(f)
+        header = next(reader, [])
+        columns = [(field, header.index(field)) for field in fields if field in header]
+        missing = {field: "" for field in fields if field not in header}
+        return [
+            {**missing, **{field: row[index] if index < len(row) else "" for field, index in columns}}
+            for row in reader
+            if row
+        ]
+
+
+def read_csv_rows(path: Path, fields: Optional[Sequence[str]] = None) -> List[Dict[str, str]]:
+    if not path.exists():
+        raise FileNotFoundError(f"CSV file not found: {path}")
+    stat = path.stat()
+    signature = (str(path.resolve()), stat.st_mtime_ns, stat.st_size, tuple(fields or ()))
+    suffix = "" if fields is None else "-" + "-".join(fields)
+    cache_path = CACHE_DIR / f"{path.stem}{suffix}.pkl"
+    try:
+        with cache_path.open("rb") as f:
+            cached_signature, rows = pickle.load(f)
+        if cached_signature == signature:
+            return rows
+    except Exception:
+        pass
+
+    rows = _parse_csv(path, fields)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with cache_path.open("wb") as f:
+            pickle.dump((signature, rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return rows
+
+
+def strip_columns(rows: List[Dict[str, str]], fields: Sequence[str]) -> Dict[str, List[str]]:
+    return {field: [str(row.get(field, "")).strip() for row in rows] for field in fields}
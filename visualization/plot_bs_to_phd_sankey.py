@@ -1,37 +1,32 @@
 from __future__ import annotations
 
-import csv
 from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 import plotly.graph_objects as go
 
+from csv_cache import read_csv_rows
+
+try:
+    import pandas as pd  # type: ignore
+except ImportError:
+    pd = None  # type: ignore
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 PROFESSORS_CSV = PROJECT_ROOT / "data" / "output" / "professors_output.csv"
 FIGURES_DIR = PROJECT_ROOT / "figures"
 
 
-def _read_csv_rows(path: Path) -> List[Dict[str, str]]:
-    if not path.exists():
-        raise FileNotFoundError(f"CSV file not found: {path}")
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        return [dict(row) for row in reader]
-
-
 def _build_sankey_data(rows: List[Dict[str, str]]) -> Tuple[List[str], List[int], List[int], List[int], int, int]:
     total_cases = len(rows)
-    valid_pairs: List[Tuple[str, str]] = []
-    for row in rows:
-        bs = str(row.get("bs_school", "")).strip()
-        phd = str(row.get("phd_school", "")).strip()
-        if bs and phd:
-            valid_pairs.append((bs, phd))
-
-    included_cases = len(valid_pairs)
-    pair_counter = Counter(valid_pairs)
+    pair_counter = Counter(
+        (bs, phd)
+        for row in rows
+        if (bs := str(row.get("bs_school", "")).strip()) and (phd := str(row.get("phd_school", "")).strip())
+    )
+    included_cases = sum(pair_counter.values())
 
     bs_nodes = sorted({bs for bs, _ in pair_counter.keys()})
     phd_nodes = sorted({phd for _, phd in pair_counter.keys()})
@@ -52,6 +47,28 @@ def _build_sankey_data(rows: List[Dict[str, str]]) -> Tuple[List[str], List[int]
     return labels, source, target, value, included_cases, total_cases
 
 
+def _build_sankey_data_from_csv(path: Path) -> Tuple[List[str], List[int], List[int], List[int], int, int]:
+    if pd is None:
+        return _build_sankey_data(read_csv_rows(path, ("bs_school", "phd_school")))
+    if not path.exists():
+        raise FileNotFoundError(f"CSV file not found: {path}")
+
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    total_cases = len(frame)
+    pairs = frame.reindex(columns=["bs_school", "phd_school"], fill_value="")
+    pairs = pairs.apply(lambda column: column.str.strip())
+    pairs = pairs[(pairs["bs_school"] != "") & (pairs["phd_school"] != "")]
+    counts = pairs.groupby(["bs_school", "phd_school"], sort=False).size()
+
+    bs_codes, bs_nodes = pd.factorize(counts.index.get_level_values(0), sort=True)
+    phd_codes, phd_nodes = pd.factorize(counts.index.get_level_values(1), sort=True)
+    labels = [f"BS: {name}" for name in bs_nodes] + [f"PhD: {name}" for name in phd_nodes]
+    source = bs_codes.tolist()
+    target = (phd_codes + len(bs_nodes)).tolist()
+    value = counts.tolist()
+    return labels, source, target, value, len(pairs), total_cases
+
+
 def _node_totals(node_count: int, source: List[int], target: List[int], value: List[int]) -> List[int]:
     totals = [0] * node_count
     for s, t, v in zip(source, target, value):
@@ -62,9 +79,7 @@ def _node_totals(node_count: int, source: List[int], target: List[int], value: L
 
 def main() -> None:
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
-    rows = _read_csv_rows(PROFESSORS_CSV)
-
-    labels, source, target, value, included_cases, total_cases = _build_sankey_data(rows)
+    labels, source, target, value, included_cases, total_cases = _build_sankey_data_from_csv(PROFESSORS_CSV)
     ratio = (included_cases / total_cases) if total_cases else 0.0
 
     if not labels or not value:
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import csv
+import os
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 
+from csv_cache import read_csv_rows, strip_columns
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SEEDS_CSV = PROJECT_ROOT / "schools_seed.csv"
@@ -20,14 +24,8 @@ DEGREE_FIELDS: Sequence[Tuple[str, str]] = (
     ("ms_school", "MS"),
     ("phd_school", "PhD"),
 )
-
-
-def _read_csv_rows(path: Path) -> List[Dict[str, str]]:
-    if not path.exists():
-        raise FileNotFoundError(f"CSV file not found: {path}")
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        return [dict(row) for row in reader]
+SEED_FIELDS = ("department_name_zh", "school_name_zh")
+PROFESSOR_FIELDS = ("department_name_zh", "school_name_zh", "bs_school", "ms_school", "phd_school")
 
 
 def _safe_filename(text: str) -> str:
@@ -36,30 +34,37 @@ def _safe_filename(text: str) -> str:
     return cleaned or "seed"
 
 
-def _coverage_ratio(rows: List[Dict[str, str]], field: str) -> Tuple[int, int, float]:
-    total = len(rows)
-    filled = sum(1 for row in rows if str(row.get(field, "")).strip())
+def _coverage_ratio(column: List[str]) -> Tuple[int, int, float]:
+    total = len(column)
+    filled = sum(1 for value in column if value)
     ratio = (filled / total) if total else 0.0
     return filled, total, ratio
 
 
-def _top_counter(rows: List[Dict[str, str]], field: str, top_n: int = 10) -> List[Tuple[str, int]]:
-    counter: Counter[str] = Counter()
-    for row in rows:
-        value = str(row.get(field, "")).strip()
-        if value:
-            counter[value] += 1
+def _top_counter(column: List[str], top_n: int = 10) -> List[Tuple[str, int]]:
+    counter = Counter(value for value in column if value)
     return counter.most_common(top_n)
 
 
+def _group_by_seed(columns: Dict[str, List[str]]) -> Dict[Tuple[str, str], Dict[str, List[str]]]:
+    groups: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+    for idx, key in enumerate(zip(columns["department_name_zh"], columns["school_name_zh"])):
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {field: [] for field, _ in DEGREE_FIELDS}
+        for field, _ in DEGREE_FIELDS:
+            group[field].append(columns[field][idx])
+    return groups
+
+
 def _setup_matplotlib() -> None:
     plt.rcParams["font.sans-serif"] = ["Microsoft YaHei", "SimHei", "Arial Unicode MS", "DejaVu Sans"]
     plt.rcParams["axes.unicode_minus"] = False
 
 
-def _draw_one_axis(ax: plt.Axes, rows: List[Dict[str, str]], field: str, degree_name: str) -> None:
-    top = _top_counter(rows, field, top_n=10)
-    filled, total, ratio = _coverage_ratio(rows, field)
+def _draw_one_axis(ax: plt.Axes, column: List[str], degree_name: str) -> None:
+    top = _top_counter(column, top_n=10)
+    filled, total, ratio = _coverage_ratio(column)
 
     if top:
         labels = [name for name, _ in top]
@@ -84,14 +89,23 @@ def _draw_one_axis(ax: plt.Axes, rows: List[Dict[str, str]], field: str, degree_
     )
 
 
-def _plot_seed_figure(seed_name: str, rows: List[Dict[str, str]], output_path: Path) -> None:
-    fig, axes = plt.subplots(1, 3, figsize=(20, 6))
+@lru_cache(maxsize=1)
+def _seed_figure() -> Tuple[plt.Figure, Sequence[plt.Axes]]:
+    return plt.subplots(1, 3, figsize=(20, 6))
+
+
+def _plot_seed_figure(seed_name: str, columns: Dict[str, List[str]], output_path: Path) -> None:
+    fig, axes = _seed_figure()
     for ax, (field, degree_name) in zip(axes, DEGREE_FIELDS):
-        _draw_one_axis(ax, rows, field, degree_name)
+        ax.clear()
+        _draw_one_axis(ax, columns[field], degree_name)
     fig.suptitle(f"{seed_name} - Graduation Schools Distribution", fontsize=14)
     fig.tight_layout(rect=[0, 0, 1, 0.95])
     fig.savefig(output_path, dpi=180)
-    plt.close(fig)
+
+
+def _plot_seed_task(task: Tuple[str, Dict[str, List[str]], Path]) -> None:
+    _plot_seed_figure(*task)
 
 
 def main() -> None:
@@ -99,27 +113,28 @@ def main() -> None:
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
     PER_SEED_DIR.mkdir(parents=True, exist_ok=True)
 
-    seeds = _read_csv_rows(SEEDS_CSV)
-    professors = _read_csv_rows(PROFESSORS_CSV)
+    seeds = read_csv_rows(SEEDS_CSV, SEED_FIELDS)
+    columns = strip_columns(read_csv_rows(PROFESSORS_CSV, PROFESSOR_FIELDS), PROFESSOR_FIELDS)
+    groups = _group_by_seed(columns)
+    empty = {field: [] for field, _ in DEGREE_FIELDS}
 
+    tasks: List[Tuple[str, Dict[str, List[str]], Path]] = []
     for idx, seed in enumerate(seeds, start=1):
         department = str(seed.get("department_name_zh", "")).strip()
         school = str(seed.get("school_name_zh", "")).strip()
         if not school:
             continue
 
-        seed_rows = [
-            row
-            for row in professors
-            if str(row.get("department_name_zh", "")).strip() == department
-            and str(row.get("school_name_zh", "")).strip() == school
-        ]
+        seed_columns = groups.get((department, school), empty)
 
         seed_title = f"{department}-{school}" if department else school
         file_name = f"{idx:02d}_{_safe_filename(seed_title)}.png"
-        _plot_seed_figure(seed_title, seed_rows, PER_SEED_DIR / file_name)
+        tasks.append((seed_title, seed_columns, PER_SEED_DIR / file_name))
+    tasks.append(("All Seeds (Overall)", columns, FIGURES_DIR / "overall_graduation_top10.png"))
 
-    _plot_seed_figure("All Seeds (Overall)", professors, FIGURES_DIR / "overall_graduation_top10.png")
+    workers = max(1, min(os.cpu_count() or 1, len(tasks)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_setup_matplotlib) as executor:
+        list(executor.map(_plot_seed_task, tasks))
     print(f"Figures generated in: {FIGURES_DIR}")
 
 
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import csv
 from pathlib import Path
 from typing import Dict, List, Sequence, Tuple
 
 import matplotlib.pyplot as plt
 
+from csv_cache import read_csv_rows, strip_columns
+
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SEEDS_CSV = PROJECT_ROOT / "schools_seed.csv"
@@ -17,13 +18,8 @@ DEGREE_FIELDS: Sequence[Tuple[str, str]] = (
     ("ms_school", "MS"),
     ("phd_school", "PhD"),
 )
-
-
-def _read_csv_rows(path: Path) -> List[Dict[str, str]]:
-    if not path.exists():
-        raise FileNotFoundError(f"CSV file not found: {path}")
-    with path.open("r", encoding="utf-8-sig", newline="") as f:
-        return [dict(row) for row in csv.DictReader(f)]
+SEED_FIELDS = ("department_name_zh", "school_name_zh")
+PROFESSOR_FIELDS = ("department_name_zh", "school_name_zh", "bs_school", "ms_school", "phd_school")
 
 
 def _setup_matplotlib() -> None:
@@ -32,8 +28,7 @@ def _setup_matplotlib() -> None:
 
 
 def _is_pku(value: str) -> bool:
-    text = str(value or "").strip().upper()
-    return text == "PKU"
+    return value.upper() == "PKU"
 
 
 def _seed_title(seed: Dict[str, str]) -> str:
@@ -42,28 +37,45 @@ def _seed_title(seed: Dict[str, str]) -> str:
     return f"{department}-{school}" if department else school
 
 
-def _top5_for_degree(
-    seeds: List[Dict[str, str]],
-    professors: List[Dict[str, str]],
-    field: str,
-) -> List[Tuple[str, float, int, int]]:
+def _group_by_seed(columns: Dict[str, List[str]]) -> Dict[Tuple[str, str], Dict[str, List[str]]]:
+    groups: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+    for idx, key in enumerate(zip(columns["department_name_zh"], columns["school_name_zh"])):
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {field: [] for field, _ in DEGREE_FIELDS}
+        for field, _ in DEGREE_FIELDS:
+            group[field].append(columns[field][idx])
+    return groups
+
+
+SeedCounts = Dict[Tuple[str, str], Dict[str, Tuple[int, int]]]
+
+
+def _count_by_seed(groups: Dict[Tuple[str, str], Dict[str, List[str]]]) -> SeedCounts:
+    counts: SeedCounts = {}
+    for key, group in groups.items():
+        counts[key] = {}
+        for field, _ in DEGREE_FIELDS:
+            collected = [value for value in group[field] if value]
+            counts[key][field] = (sum(1 for value in collected if _is_pku(value)), len(collected))
+    return counts
+
+
+def _count_by_seed_from_csv(path: Path) -> SeedCounts:
+    columns = strip_columns(read_csv_rows(path, PROFESSOR_FIELDS), PROFESSOR_FIELDS)
+    return _count_by_seed(_group_by_seed(columns))
+
+
+def _top5_for_degree(seeds: List[Dict[str, str]], counts: SeedCounts, field: str) -> List[Tuple[str, float, int, int]]:
     results: List[Tuple[str, float, int, int]] = []
 
     for seed in seeds:
         department = str(seed.get("department_name_zh", "")).strip()
         school = str(seed.get("school_name_zh", "")).strip()
-        rows = [
-            row
-            for row in professors
-            if str(row.get("department_name_zh", "")).strip() == department
-            and str(row.get("school_name_zh", "")).strip() == school
-        ]
-
-        collected = [row for row in rows if str(row.get(field, "")).strip()]
-        denominator = len(collected)
+        group = counts.get((department, school))
+        numerator, denominator = group[field] if group else (0, 0)
         if denominator == 0:
             continue
-        numerator = sum(1 for row in collected if _is_pku(str(row.get(field, ""))))
         ratio = numerator / denominator
         results.append((_seed_title(seed), ratio, numerator, denominator))
 
@@ -115,11 +127,11 @@ def main() -> None:
     _setup_matplotlib()
     FIGURES_DIR.mkdir(parents=True, exist_ok=True)
 
-    seeds = _read_csv_rows(SEEDS_CSV)
-    professors = _read_csv_rows(PROFESSORS_CSV)
+    seeds = read_csv_rows(SEEDS_CSV, SEED_FIELDS)
+    counts = _count_by_seed_from_csv(PROFESSORS_CSV)
 
     for field, degree_name in DEGREE_FIELDS:
-        top5 = _top5_for_degree(seeds, professors, field)
+        top5 = _top5_for_degree(seeds, counts, field)
         output_path = FIGURES_DIR / f"top5_pku_ratio_{field}.png"
         _plot_degree_top5(degree_name, top5, output_path)
         print(f"Saved: {output_path}")